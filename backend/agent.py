@@ -1,96 +1,631 @@
 # agent.py
-from flask import Flask, request, jsonify
+import time
+_MODULE_STARTED = time.perf_counter()
+
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import asyncio
+import json
 import uuid
+import contextvars
 from pathlib import Path
 from textwrap import dedent
+from types import SimpleNamespace
+from contextlib import asynccontextmanager
 import datetime
+import os
 
-# Web scraping imports
-import requests
-from bs4 import BeautifulSoup
-import re
+from dotenv import load_dotenv
 
-# --- Agno & OpenAI Libraries ---
-try:
-    from agno.agent import Agent
-    from agno.team import Team
-    from agno.models.openai import OpenAIChat
-    from agno.tools.googlesearch import GoogleSearchTools
-    from agno.tools.mcp import MCPTools
-    from agno.tools import tool
-    from agno.tools.user_control_flow import UserControlFlowTools
-    from dotenv import load_dotenv
-    from agno.knowledge.markdown import MarkdownKnowledgeBase
-    from agno.vectordb.lancedb import LanceDb
-except ImportError as e:
-    print(f"Hata: Gerekli kütüphanelerden biri eksik: {e}")
-    exit(1)
+from jobs import BackgroundLoop, JobManager, QueueFullError, SUCCEEDED, FAILED, CANCELLED
+from page_cache import PageCache, normalize_url
+from plan_cache import PlanCache
+from search_cache import SearchCache, RateLimiter
+from web_reader import fetch_page
+from kb_indexer import KnowledgeIndexer
+from components import ComponentRegistry
+from mcp_pool import MCPSessionPool
+from workspaces import WorkspaceManager
+from checkpoints import CheckpointStore
+from compaction import compact, estimate_tokens
+from metrics import MetricsRegistry, RunTrace, current_trace, COUNTER, GAUGE, HISTOGRAM
+from agent_templates import AgentTemplate, TemplateRegistry
+import roadmap
+from roadmap import ROADMAP_BANNED_TERMS, ROADMAP_HEADERS
 
 # --- Flask, CORS, Project Configuration ---
 app = Flask(__name__)
 CORS(app)
 load_dotenv()
-OUTPUT_DIR = Path(__file__).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+# AGENT_OUTPUT_DIR: tüm çalışma verisinin (çalıştırmalar, önbellekler, vektör DB) kökü; benchmark yalıtımı için
+OUTPUT_DIR = Path(os.getenv("AGENT_OUTPUT_DIR", Path(__file__).parent / "output"))
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 KB_DIR = Path(__file__).parent / "kb"
 KB_DIR.mkdir(exist_ok=True)
 LANCEDB_URI = OUTPUT_DIR / "vector_db"
-knowledge_vector_db = LanceDb(table_name="markdown_kb", uri=LANCEDB_URI)
-knowledge_base = MarkdownKnowledgeBase(path=KB_DIR, vector_db=knowledge_vector_db)
-# İlk indeksleme için bir kez True, sonra False kullanın
-try:
-	knowledge_base.load(recreate=False)
-except Exception as e:
-	print(f"Knowledge base load error: {e}")
+# Her çalıştırma kendi dizinine yazar: output/runs/<session_id>/
+WORKSPACES_DIR = OUTPUT_DIR / "runs"
+WORKSPACE_MAX_AGE_HOURS = float(os.getenv("WORKSPACE_MAX_AGE_HOURS", "72"))
+WORKSPACE_MAX_TOTAL_MB = int(os.getenv("WORKSPACE_MAX_TOTAL_MB", "512"))
+# Artımlı indeksleme: yalnızca eklenen/değişen/silinen KB dosyaları yeniden gömülür.
+# KB_WATCH_INTERVAL saniyede bir kb/ dizini yoklanır (0 = yalnızca açılışta eşitle).
+KB_WATCH_INTERVAL = float(os.getenv("KB_WATCH_INTERVAL", "30"))
+# STARTUP_MODE: background (port açılır, ağır bileşenler arka planda ısınır),
+# lazy (yalnızca ilk kullanımda başlatılır), eager (port açılmadan önce hepsi yüklenir)
+STARTUP_MODE = os.getenv("STARTUP_MODE", "background").lower()
+# EXECUTION_MODE: coordinate (koordinatörlü agno Team) veya pipeline (paralel arama, toplu
+# okuma, tek analiz ve paralel doküman üretimi). İstek gövdesindeki 'mode' ile ezilebilir.
+EXECUTION_MODES = ('coordinate', 'pipeline')
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "coordinate").lower()
+PIPELINE_URLS_PER_QUERY = int(os.getenv("PIPELINE_URLS_PER_QUERY", "2"))
+PIPELINE_SEARCH_LANGUAGE = os.getenv("PIPELINE_SEARCH_LANGUAGE", "tr")
+# Bağlam sıkıştırma: okunan metin parçalanır, kaynaklar arası tekrarlar elenir, analiz odaklarına
+# göre sıralanıp ajan başına token bütçesine sığdırılır. Bütçe 0 = o ajan için sıkıştırma kapalı.
+READER_CONTEXT_TOKENS = int(os.getenv("READER_CONTEXT_TOKENS", "2500"))
+ANALYST_CONTEXT_TOKENS = int(os.getenv("ANALYST_CONTEXT_TOKENS", "3000"))
+WRITER_CONTEXT_TOKENS = int(os.getenv("WRITER_CONTEXT_TOKENS", "1500"))
+CONTEXT_CHUNK_CHARS = int(os.getenv("CONTEXT_CHUNK_CHARS", "600"))
+# FS_TOOLS_BACKEND: mcp (paylaşılan, uzun ömürlü MCP filesystem oturumları havuzu) veya
+# local (alt süreçsiz, çalıştırma dizinine kısıtlı süreç içi write_file/read_file aracı).
+# MCP_POOL_SIZE=0 ise her çalıştırma için kökü yalnızca kendi dizini olan bir MCP sunucusu açılır.
+FS_TOOLS_BACKEND = os.getenv("FS_TOOLS_BACKEND", "mcp").lower()
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", os.getenv("MAX_CONCURRENT_RUNS", "4")))
+MCP_ACQUIRE_TIMEOUT = float(os.getenv("MCP_ACQUIRE_TIMEOUT", "120"))
+# AGENT_DEBUG: agno debug_mode (tam prompt/yanıt dökümü). Üretimde kapatılması önerilir;
+# sayısal gözlemlenebilirlik /metrics ve çalıştırma başına trace.json üzerinden sağlanır.
+AGENT_DEBUG = os.getenv("AGENT_DEBUG", "true").lower() in ("1", "true", "yes", "on")
+# Tüm ajan modelleri tek bir httpx.AsyncClient bağlantı havuzunu paylaşır; bağlantılar (TLS dahil)
+# istekler arasında açık tutulur. İstemci paylaşılan arka plan döngüsünde kullanılır.
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# --- Instrumentation ---
+metrics = MetricsRegistry(prefix="agent_")
+metrics.describe('run_seconds', HISTOGRAM, 'End-to-end plan execution time.')
+metrics.describe('stage_seconds', HISTOGRAM, 'Wall time per execution stage.')
+metrics.describe('agent_run_seconds', HISTOGRAM, 'Wall time per agent run, including its tool calls.')
+metrics.describe('llm_request_seconds', HISTOGRAM, 'Model request latency as reported by agno.')
+metrics.describe('llm_requests_total', COUNTER, 'Model requests.')
+metrics.describe('llm_tokens_total', COUNTER, 'Model tokens by direction (input/output).')
+metrics.describe('tool_call_seconds', HISTOGRAM, 'Tool call duration.')
+metrics.describe('page_fetch_seconds', HISTOGRAM, 'read_articles time per URL by cache outcome.')
+metrics.describe('kb_query_seconds', HISTOGRAM, 'Knowledge base query latency.')
+metrics.describe('context_tokens_total', COUNTER, 'Estimated context tokens before (input) and after (output) compaction.')
+metrics.describe('context_duplicates_total', COUNTER, 'Near-duplicate chunks dropped by compaction.')
+metrics.describe('roadmap_checks_total', COUNTER, 'Roadmap validations by result (valid/fixed_locally/rows_repaired/regenerated/regenerated_invalid/repair_failed).')
+metrics.describe('roadmap_violations_total', COUNTER, 'Roadmap violations found on first validation, by code.')
+metrics.describe('roadmap_regenerations_total', COUNTER, 'Full roadmap regenerations by reason (structure/rows_unresolved).')
+metrics.describe('jobs', GAUGE, 'Jobs by queue and status.')
+metrics.describe('page_cache_events_total', COUNTER, 'Page cache lookups and writes by event.')
+metrics.describe('plan_cache_events_total', COUNTER, 'Plan cache lookups and writes by event.')
+metrics.describe('search_cache_events_total', COUNTER, 'Search cache lookups and writes by event.')
+metrics.describe('search_rate_limit_wait_seconds_total', COUNTER, 'Time outbound searches waited for the rate limiter.')
+metrics.describe('components_ready', GAUGE, 'Whether every lazy component is initialized.')
+
+# --- Agno & OpenAI Libraries (lazy) ---
+# Ağır importlar ve kurulumlar bileşen kaydı üzerinden yapılır; süreleri /readyz'de raporlanır.
+components = ComponentRegistry()
+
+def _import_agno():
+    from agno.agent import Agent
+    from agno.team import Team
+    from agno.models.openai import OpenAIChat
+    from agno.tools import tool
+    return SimpleNamespace(Agent=Agent, Team=Team, OpenAIChat=OpenAIChat, tool=tool)
+
+def _import_lancedb():
+    from agno.vectordb.lancedb import LanceDb
+    return LanceDb
+
+def _import_markdown_kb():
+    from agno.knowledge.markdown import MarkdownKnowledgeBase
+    return MarkdownKnowledgeBase
+
+def _import_search_tools():
+    from agno.tools.googlesearch import GoogleSearchTools
+    return GoogleSearchTools
+
+def _import_cached_search_tools():
+    from search_tools import CachedSearchTools
+    return CachedSearchTools
+
+def _make_search_tools_factory(CachedSearchTools, GoogleSearchTools):
+    # Alttaki arama aracı paylaşılır; önbellek ve sınırlayıcı tüm çalıştırmalar için ortaktır,
+    # URL tekilleştirme ise her çalıştırmanın kendi örneğinde tutulur
+    backend = GoogleSearchTools()
+    return lambda dedupe=True: CachedSearchTools(backend, search_cache, search_limiter, dedupe=dedupe)
+
+def _import_httpx():
+    import httpx
+    return httpx
+
+def _make_openai_http_client(httpx):
+    # agno her model çağrısında bu istemciyle bir AsyncOpenAI kurar; bağlantı havuzu paylaşılır
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=OPENAI_TIMEOUT,
+    )
+
+def _import_mcp_tools():
+    from agno.tools.mcp import MCPTools
+    return MCPTools
+
+def _import_local_file_tools():
+    from file_tools import LocalFileTools
+    return LocalFileTools
+
+def _start_mcp_pool(_, MCPTools):
+    pool = MCPSessionPool(
+        lambda: MCPTools(f"npx -y @modelcontextprotocol/server-filesystem {WORKSPACES_DIR.resolve()}", timeout_seconds=10),
+        size=MCP_POOL_SIZE,
+    )
+    # Oturumlar ilk çalıştırmayı beklemeden paylaşılan döngüde açılmaya başlar
+    background_loop.submit(pool.start())
+    return pool
+
+def _start_kb_indexer(_, knowledge_base):
+    indexer = KnowledgeIndexer(
+        knowledge_base,
+        kb_dir=KB_DIR,
+        manifest_path=OUTPUT_DIR / "kb_manifest.json",
+        poll_interval=KB_WATCH_INTERVAL,
+    )
+    indexer.start()
+    return indexer
 
-pending_runs = {}
+components.register('agno', _import_agno)
+components.register('vector_db', _import_lancedb,
+                    lambda LanceDb: LanceDb(table_name="markdown_kb", uri=LANCEDB_URI))
+components.register('knowledge_base', _import_markdown_kb,
+                    lambda MarkdownKnowledgeBase, vector_db: MarkdownKnowledgeBase(path=KB_DIR, vector_db=vector_db),
+                    deps=('vector_db',))
+components.register('kb_indexer', lambda: None, _start_kb_indexer, deps=('knowledge_base',))
+components.register('openai_http_client', _import_httpx, _make_openai_http_client)
+components.register('search_tools', _import_search_tools)
+components.register('cached_search_tools', _import_cached_search_tools, _make_search_tools_factory,
+                    deps=('search_tools',))
+if FS_TOOLS_BACKEND == 'local':
+    components.register('local_file_tools', _import_local_file_tools)
+else:
+    components.register('mcp_tools', _import_mcp_tools)
+    if MCP_POOL_SIZE > 0:
+        components.register('mcp_pool', lambda: None, _start_mcp_pool, deps=('mcp_tools',))
+components.register('read_articles_tool', lambda: None,
+                    lambda _, agno: agno.tool(read_articles), deps=('agno',))
+
+# --- Shared event loop & job engine ---
+# Tüm ajan çalıştırmaları tek bir uzun ömürlü asyncio döngüsünde yürür; istek başına asyncio.run yok.
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "4"))
+MAX_QUEUED_RUNS = int(os.getenv("MAX_QUEUED_RUNS", "16"))
+MAX_CONCURRENT_PLANS = int(os.getenv("MAX_CONCURRENT_PLANS", "8"))
+background_loop = BackgroundLoop()
+jobs = JobManager(background_loop, max_concurrency=MAX_CONCURRENT_RUNS, max_queue=MAX_QUEUED_RUNS)
+# Kısa süren plan üretimleri uzun yürütmelerin arkasında beklemesin diye ayrı kuyrukta
+plan_jobs = JobManager(background_loop, max_concurrency=MAX_CONCURRENT_PLANS, max_queue=MAX_QUEUED_RUNS)
+
+def find_job(job_id: str):
+    return jobs.get(job_id) or plan_jobs.get(job_id)
+
+workspaces = WorkspaceManager(
+    WORKSPACES_DIR,
+    max_age_seconds=WORKSPACE_MAX_AGE_HOURS * 3600,
+    max_total_bytes=WORKSPACE_MAX_TOTAL_MB * 1024 * 1024,
+    active_sessions=jobs.active_session_ids,
+)
+
+@asynccontextmanager
+async def acquire_fs_tools(workspace):
+    """Çalıştırma için dosya araçlarını sağlar: havuzdan bir MCP oturumu ya da süreç içi yazıcı."""
+    if FS_TOOLS_BACKEND == 'local':
+        LocalFileTools = await components.aget('local_file_tools')
+        yield LocalFileTools(workspace.path)
+        return
+    if MCP_POOL_SIZE <= 0:
+        MCPTools = await components.aget('mcp_tools')
+        async with MCPTools(f"npx -y @modelcontextprotocol/server-filesystem {workspace.path}", timeout_seconds=10) as fs_tools:
+            yield fs_tools
+        return
+    pool = await components.aget('mcp_pool')
+    async with pool.acquire(timeout=MCP_ACQUIRE_TIMEOUT) as fs_tools:
+        yield fs_tools
+
+# --- Page cache for read_articles ---
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", str(6 * 3600)))
+PAGE_CACHE_MAX_MB = int(os.getenv("PAGE_CACHE_MAX_MB", "64"))
+# Sayfa başına toplanan ve önbelleğe yazılan metin üst sınırı (varsayılan max_chars'ın iki katı)
+PAGE_CACHE_MAX_TEXT_CHARS = int(os.getenv("PAGE_CACHE_MAX_TEXT_CHARS", "6000"))
+page_cache = PageCache(
+    OUTPUT_DIR / "page_cache.sqlite3",
+    ttl_seconds=PAGE_CACHE_TTL,
+    max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024,
+)
+
+# --- Search cache & rate limit for google_search ---
+# Aynı sorgular çalıştırmalar ve kullanıcılar arasında SEARCH_CACHE_TTL boyunca tekrar aranmaz;
+# canlı aramalar dakikada SEARCH_RATE_PER_MINUTE ve aynı anda SEARCH_MAX_CONCURRENCY ile sınırlıdır.
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_RATE_PER_MINUTE = float(os.getenv("SEARCH_RATE_PER_MINUTE", "30"))
+SEARCH_RATE_BURST = int(os.getenv("SEARCH_RATE_BURST", "5"))
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "2"))
+search_cache = SearchCache(
+    OUTPUT_DIR / "search_cache.sqlite3",
+    ttl_seconds=SEARCH_CACHE_TTL,
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+)
+search_limiter = RateLimiter(
+    rate_per_minute=SEARCH_RATE_PER_MINUTE,
+    burst=SEARCH_RATE_BURST,
+    max_concurrency=SEARCH_MAX_CONCURRENCY,
+)
+
+# --- Plan cache for /generate-plan ---
+# Anahtar: normalize edilmiş mesaj + gün (planlayıcı talimatı bugünün tarihini içerir).
+# PLAN_CACHE_SEMANTIC açıksa birebir eşleşme yoksa mesaj LanceDB embedder'ı ile gömülür ve
+# aynı günün istekleri arasında PLAN_CACHE_SIMILARITY eşiğini aşan plan döndürülür.
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", str(24 * 3600)))
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1000"))
+PLAN_CACHE_SEMANTIC = os.getenv("PLAN_CACHE_SEMANTIC", "false").lower() in ("1", "true", "yes", "on")
+PLAN_CACHE_SIMILARITY = float(os.getenv("PLAN_CACHE_SIMILARITY", "0.95"))
+plan_cache = PlanCache(
+    OUTPUT_DIR / "plan_cache.sqlite3",
+    ttl_seconds=PLAN_CACHE_TTL,
+    max_entries=PLAN_CACHE_MAX_ENTRIES,
+    similarity_threshold=PLAN_CACHE_SIMILARITY,
+)
 
 # --- Custom Tool: read_articles ---
-@tool
-def read_articles(urls: list[str]) -> str:
-    """Fetch and combine readable text content from multiple URLs into a single string."""
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+def _fetch_articles(urls: list[str]) -> list[tuple[str, str, str]]:
+    """URL sırasıyla (url, sonuç, metin) döndürür; sonuç 'error' ise metin hata mesajıdır."""
+    from concurrent.futures import ThreadPoolExecutor
 
-    def fetch(url: str, timeout: int = 6, max_chars: int = 3000) -> str:
+    # Havuz thread'leri contextvar'ı devralmaz; iz burada yakalanıp açıkça verilir
+    trace = current_trace.get()
+
+    def fetch(url: str) -> tuple[str, str, str]:
+        started = time.perf_counter()
+        outcome, text = fetch_one(url)
+        metrics.record('page_fetch_seconds', time.perf_counter() - started, span='page_fetch', trace=trace, outcome=outcome)
+        if trace is not None:
+            trace.incr('pages_read')
+        return url, outcome, text
+
+    def fetch_one(url: str, timeout: int = 6, max_chars: int = 3000) -> tuple[str, str]:
+        key = normalize_url(url)
+        cached = page_cache.get(key)
+        if cached is not None and cached.is_fresh(page_cache.ttl_seconds):
+            page_cache.count('hits')
+            return 'hit', cached.text[:max_chars]
+
+        headers = {}
+        if cached is not None:
+            # Süresi dolmuş kayıt: koşullu istekle yeniden doğrula
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
         try:
-            response = requests.get(url, timeout=timeout, headers={'User-Agent': 'Mozilla/5.0'})
-            response.raise_for_status()
-            
-            if response.encoding is None:
-                response.encoding = getattr(response, "apparent_encoding", None) or 'utf-8'
-            
-            try:
-                soup = BeautifulSoup(response.text, 'html.parser')
-            except UnicodeDecodeError:
-                enc = getattr(response, "apparent_encoding", None) or 'utf-8'
-                soup = BeautifulSoup(response.content.decode(enc, errors='replace'), 'html.parser')
-
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-                element.decompose()
-            
-            text = soup.get_text(separator=' ', strip=True)
-            text = re.sub(r'\s+', ' ', text)
-            text = ''.join(char for char in text if char.isprintable() or char in '\n\t')
-            
-            return f"\n\n--- CONTENT FROM {url} ---\n\n{text[:max_chars]}"
+            page = fetch_page(url, timeout=timeout, max_chars=PAGE_CACHE_MAX_TEXT_CHARS, headers=headers)
+            if page.not_modified and cached is not None:
+                page_cache.touch(key)
+                page_cache.count('revalidated')
+                return 'revalidated', cached.text[:max_chars]
+            if page.timed_out:
+                # Süre bütçesinde yarım kalan metin iyi bir kaydın yerine yazılmaz ve önbelleğe
+                # alınmaz; varsa önbellekteki tam metin kullanılır
+                if cached is not None:
+                    page_cache.count('stale_served')
+                    return 'stale', cached.text[:max_chars]
+                page_cache.count('partial')
+                return 'partial', page.text[:max_chars]
+            text = page.text
+
+            page_cache.count('misses')
+            page_cache.put(key, text, etag=page.etag, last_modified=page.last_modified)
+            return 'miss', text[:max_chars]
         except Exception as e:
-            return f"\n\n--- ERROR READING {url}: {str(e)} ---\n\n"
+            # Site yavaş/erişilemezse eski de olsa önbellekteki metni kullan
+            if cached is not None:
+                page_cache.count('stale_served')
+                return 'stale', cached.text[:max_chars]
+            return 'error', str(e)
 
-    combined_text = ""
     max_workers = min(8, max(1, len(urls)))
     with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = {ex.submit(fetch, u): u for u in urls}
-        for fut in as_completed(futures):
-            combined_text += fut.result()
+        return list(ex.map(fetch, urls))
+
+def _format_articles(pages: list[tuple[str, str, str]]) -> str:
+    combined_text = ""
+    for url, outcome, text in pages:
+        if outcome == 'error':
+            combined_text += f"\n\n--- ERROR READING {url}: {text} ---\n\n"
+        else:
+            combined_text += f"\n\n--- CONTENT FROM {url} ---\n\n{text}"
     return combined_text
 
+def _read_articles(urls: list[str]) -> str:
+    return _format_articles(_fetch_articles(urls))
+
+async def read_articles(urls: list[str]) -> str:
+    """Fetch and combine readable text content from multiple URLs into a single string."""
+    # Ağ istekleri paylaşılan döngüyü bloklamasın diye thread'de çalışır
+    pages = await asyncio.to_thread(_fetch_articles, urls)
+    if READER_CONTEXT_TOKENS <= 0:
+        return _format_articles(pages)
+    sources = [(url, text) for url, outcome, text in pages if outcome != 'error']
+    result = await asyncio.to_thread(compact_context, sources, run_focus.get(), READER_CONTEXT_TOKENS, 'reader')
+    errors = _format_articles([p for p in pages if p[1] == 'error'])
+    return result.text + errors
+
+# --- Context compaction ---
+# Çalıştırmanın analiz odakları ve sorguları; okuma aracı sıralamayı buna göre yapar
+run_focus: contextvars.ContextVar = contextvars.ContextVar('run_focus', default=())
+
+def compact_context(sources: list[tuple[str, str]], focuses, budget_tokens: int, stage: str):
+    """Kaynakları odaklara göre sıkıştırır ve önce/sonra token sayılarını metriklere yazar."""
+    result = compact(sources, list(focuses), budget_tokens, chunk_chars=CONTEXT_CHUNK_CHARS)
+    stats = result.stats
+    metrics.inc('context_tokens_total', stats['input_tokens'], stage=stage, kind='input')
+    metrics.inc('context_tokens_total', stats['output_tokens'], stage=stage, kind='output')
+    metrics.inc('context_duplicates_total', stats['duplicates'], stage=stage)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.incr('context_tokens_saved', max(0, stats['input_tokens'] - stats['output_tokens']))
+    return result
+
+# --- Streaming: agno olaylarını ilerleme olaylarına çevirme ---
+MEMBER_DELEGATION_TOOLS = ('transfer_task_to_member', 'forward_task_to_member')
+# Koordinatör modunda üye çıktıları bu aşama adlarıyla kaydedilir (üye kimliği -> aşama, başlık)
+TEAM_MEMBER_STAGES = {
+    'searcher': ('team-search', 'Arama sonuçları'),
+    'reader': ('team-read', 'İçerik özetleri'),
+    'analyst': ('team-analysis', 'Analiz'),
+}
+MAX_EVENT_PAYLOAD_CHARS = 2000
+
+def _noop_emit(event: str, data: dict | None = None):
+    pass
+
+def _tool_fields(ev) -> tuple[str, dict, object]:
+    """Olaydaki araç çağrısının adını, argümanlarını ve sonucunu döndürür."""
+    tool = getattr(ev, 'tool', None)
+    if tool is None:
+        tools = getattr(ev, 'tools', None) or []
+        tool = tools[-1] if tools else None
+    if isinstance(tool, dict):
+        return tool.get('tool_name') or '', tool.get('tool_args') or {}, tool.get('content') or tool.get('result')
+    return getattr(tool, 'tool_name', '') or '', getattr(tool, 'tool_args', None) or {}, getattr(tool, 'result', None)
+
+def _tool_key(ev, actor: str, tool_name: str):
+    tool = getattr(ev, 'tool', None)
+    call_id = tool.get('tool_call_id') if isinstance(tool, dict) else getattr(tool, 'tool_call_id', None)
+    return call_id or (actor, tool_name)
+
+def _metric_total(value) -> float:
+    if isinstance(value, (list, tuple)):
+        return sum(v for v in value if isinstance(v, (int, float)))
+    return value if isinstance(value, (int, float)) else 0
+
+def record_usage(agent_name: str, run_response):
+    """Bir çalıştırma yanıtındaki model süre ve token metriklerini kaydeder.
+
+    agno 1.x metrikleri model isteği başına liste tutan bir dict'tir; nesne biçimi de desteklenir.
+    """
+    usage = getattr(run_response, 'metrics', None)
+    if not usage:
+        return
+    field = usage.get if isinstance(usage, dict) else (lambda key: getattr(usage, key, None))
+    trace = current_trace.get()
+    durations = field('time')
+    durations = durations if isinstance(durations, (list, tuple)) else [durations] if durations else []
+    for seconds in durations:
+        if isinstance(seconds, (int, float)):
+            metrics.record('llm_request_seconds', seconds, span='llm', agent=agent_name)
+    requests = max(1, len(durations))
+    metrics.inc('llm_requests_total', requests, agent=agent_name)
+    for direction in ('input', 'output'):
+        tokens = _metric_total(field(f'{direction}_tokens'))
+        metrics.inc('llm_tokens_total', tokens, agent=agent_name, direction=direction)
+        if trace is not None:
+            trace.incr(f'{direction}_tokens', tokens)
+    if trace is not None:
+        trace.incr('llm_requests', requests)
+
+def _truncate(value, limit: int = MAX_EVENT_PAYLOAD_CHARS):
+    text = value if isinstance(value, str) else str(value)
+    return text if len(text) <= limit else text[:limit] + '…'
+
+async def consume_run_stream(stream, emit, source: str, content_event: str = 'RunResponseContent',
+                             on_tool_completed=None) -> str:
+    """agno olay akışını tüketir, ilerleme olaylarını yayar ve üst seviye yanıt metnini döndürür.
+
+    `content_event` üst seviye içerik olayının adıdır (takım için 'TeamRunResponseContent');
+    üye ajanların içerik parçaları token olarak yayılır ama sonuca eklenmez.
+    """
+    content_parts = []
+    agent_started, tool_started = {}, {}
+    trace = current_trace.get()
+    async for ev in stream:
+        name = getattr(ev, 'event', '') or ''
+        kind = name[4:] if name.startswith('Team') else name
+        actor = getattr(ev, 'agent_name', None) or getattr(ev, 'team_name', None) or source
+
+        if kind == 'RunResponseContent':
+            chunk = getattr(ev, 'content', None)
+            if isinstance(chunk, str) and chunk:
+                if name == content_event:
+                    content_parts.append(chunk)
+                emit('token', {'agent': actor, 'content': chunk})
+        elif kind == 'RunStarted':
+            agent_started[actor] = time.perf_counter()
+            emit('agent_started', {'agent': actor})
+        elif kind == 'RunCompleted':
+            if actor in agent_started:
+                metrics.record('agent_run_seconds', time.perf_counter() - agent_started.pop(actor), span='agent', agent=actor)
+            emit('agent_finished', {'agent': actor})
+        elif kind == 'RunError':
+            if actor in agent_started:
+                metrics.record('agent_run_seconds', time.perf_counter() - agent_started.pop(actor), span='agent', agent=actor)
+            emit('agent_error', {'agent': actor, 'error': _truncate(getattr(ev, 'content', ''))})
+        elif kind == 'ToolCallStarted':
+            tool_name, tool_args, _ = _tool_fields(ev)
+            tool_started[_tool_key(ev, actor, tool_name)] = time.perf_counter()
+            if tool_name in MEMBER_DELEGATION_TOOLS:
+                emit('member_started', {'member': tool_args.get('member_id'), 'task': _truncate(tool_args.get('task_description') or tool_args.get('expected_output') or '')})
+            emit('tool_call_started', {'agent': actor, 'tool': tool_name, 'args': {k: _truncate(v, 500) for k, v in tool_args.items()}})
+        elif kind == 'ToolCallCompleted':
+            tool_name, tool_args, result = _tool_fields(ev)
+            started = tool_started.pop(_tool_key(ev, actor, tool_name), None)
+            if started is not None:
+                metrics.record('tool_call_seconds', time.perf_counter() - started, span='tool', tool=tool_name)
+            if trace is not None:
+                trace.incr('tool_calls')
+            if tool_name in MEMBER_DELEGATION_TOOLS:
+                emit('member_finished', {'member': tool_args.get('member_id')})
+            elif tool_name == 'google_search':
+                try:
+                    results = json.loads(result) if isinstance(result, str) else result
+                except (TypeError, ValueError):
+                    results = result
+                emit('search_results', {'agent': actor, 'query': tool_args.get('query'), 'results': results})
+            emit('tool_call_completed', {'agent': actor, 'tool': tool_name, 'result': _truncate(result or '')})
+            if on_tool_completed is not None:
+                on_tool_completed(tool_name, tool_args, result)
+    return ''.join(content_parts)
+
+def emit_written_documents(base_dir: Path, file_names: list[str], seen: dict, emit):
+    """Çalıştırma dizininde yeni yazılmış/değişmiş dosyaları 'document' olayı olarak yayar."""
+    for fname in file_names:
+        file_path = base_dir / fname
+        try:
+            mtime = file_path.stat().st_mtime
+        except OSError:
+            continue
+        if seen.get(fname) == mtime:
+            continue
+        try:
+            content = file_path.read_text(encoding='utf-8')
+        except Exception:
+            continue
+        seen[fname] = mtime
+        emit('document', {'filename': str(fname), 'content': content})
+
+def sse_response(job, after: int = -1):
+    """Bir işin olaylarını text/event-stream olarak akıtır."""
+    def generate():
+        for item in job.iter_events(after=after):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            idx, event, data = item
+            payload = json.dumps(data, ensure_ascii=False, default=str)
+            yield f"id: {idx}\nevent: {event}\ndata: {payload}\n\n"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 # ==============================================================================
 # NEW TWO-PHASE SYSTEM: PLAN FIRST, THEN EXECUTE
 # ==============================================================================
 
 # Phase 1: Planning Agent - Creates detailed action plan
+async def _embed_message(text: str):
+    """Plan önbelleğinin anlamsal eşleşmesi için mesaj gömmesi (vektör DB'nin embedder'ı)."""
+    try:
+        vector_db = await components.aget('vector_db')
+        return await asyncio.to_thread(vector_db.embedder.get_embedding, text)
+    except Exception:
+        return None
+
+async def lookup_cached_plan(user_message: str, day: str):
+    """Önce birebir, PLAN_CACHE_SEMANTIC açıksa anlamsal eşleşme arar.
+
+    (eşleşme ya da None, hesaplandıysa mesaj gömmesi) döndürür; gömme kayıt sırasında yeniden kullanılır.
+    """
+    match = await asyncio.to_thread(plan_cache.get, user_message, day)
+    embedding = None
+    if match is None and PLAN_CACHE_SEMANTIC:
+        embedding = await _embed_message(user_message)
+        if embedding:
+            match = await asyncio.to_thread(plan_cache.find_similar, embedding, day)
+    plan_cache.count('misses' if match is None else f"{match.match}_hits")
+    return match, embedding
+
+async def generate_plan(user_message: str, session_id: str, emit=_noop_emit, use_cache: bool = True) -> dict:
+    """Kullanıcı isteğinden düzenlenebilir bir eylem planı üretir.
+
+    `use_cache=False` önbellek okumasını atlar; üretilen plan yine de önbelleğe yazılır.
+    """
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    embedding = None
+    if PLAN_CACHE_ENABLED and not use_cache:
+        plan_cache.count('bypassed')
+    elif PLAN_CACHE_ENABLED:
+        cached, embedding = await lookup_cached_plan(user_message, today)
+        if cached is not None:
+            emit('plan_cache_hit', {'match': cached.match, 'similarity': cached.similarity})
+            return {
+                'success': True,
+                'plan': cached.plan,
+                'session_id': session_id,
+                'cache': {'match': cached.match, 'similarity': cached.similarity, 'created_at': cached.created_at},
+                'message': 'Action plan generated successfully. Please review and modify as needed.'
+            }
+
+    templates = await components.aget('agent_templates')
+    # Bilgi tabanı indeksleyici üzerinden alınır ki lazy modda da ilk eşitleme başlasın
+    knowledge_base = (await components.aget('kb_indexer')).knowledge_base
+    planning_agent = templates.build('planner', {'today': today}, session_id=session_id, knowledge=knowledge_base)
+
+    with metrics.timed('stage_seconds', stage='plan'):
+        stream = await planning_agent.arun(user_message, stream=True, stream_intermediate_steps=True)
+        content = await consume_run_stream(stream, emit, source='Planlama Ajanı')
+    run_response = getattr(planning_agent, 'run_response', None)
+    record_usage('Planlama Ajanı', run_response)
+    if getattr(run_response, 'content', None):
+        content = run_response.content
+    
+    try:
+        # Try to parse the response as JSON
+        plan_data = json.loads(content)
+        if PLAN_CACHE_ENABLED and isinstance(plan_data, dict):
+            if embedding is None and PLAN_CACHE_SEMANTIC:
+                embedding = await _embed_message(user_message)
+            await asyncio.to_thread(plan_cache.put, user_message, today, plan_data, embedding)
+        
+        return {
+            'success': True,
+            'plan': plan_data,
+            'session_id': session_id,
+            'message': 'Action plan generated successfully. Please review and modify as needed.'
+        }
+    except json.JSONDecodeError:
+        # If not valid JSON, return as structured text
+        return {
+            'success': True,
+            'plan': {
+                'raw_plan': content,
+                'research_queries': [],
+                'analysis_focus': []
+            },
+            'session_id': session_id,
+            'message': 'Plan generated. Please structure the plan data manually.'
+        }
+
+def _plan_cache_requested(data: dict) -> bool:
+    """İstek gövdesinde no_cache ya da Cache-Control: no-cache başlığı önbelleği atlar."""
+    return not (data.get('no_cache') or 'no-cache' in request.headers.get('Cache-Control', '').lower())
+
 @app.route('/generate-plan', methods=['POST'])
 def generate_plan_endpoint():
     data = request.json
@@ -99,65 +634,29 @@ def generate_plan_endpoint():
         return jsonify({'error': 'Message cannot be empty'}), 400
 
     session_id = str(uuid.uuid4())
+    return jsonify(background_loop.run(generate_plan(user_message, session_id, use_cache=_plan_cache_requested(data))))
 
-    async def _run():
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        planning_agent = Agent(
-            model=OpenAIChat(id="gpt-4o-mini"),
-            tools=[],  # Planning agent doesn't need external tools
-            instructions=[
-                f"Sen iş araştırması ve teklif oluşturma için Stratejik Planlama Ajanısın. Bugünün tarihi: {today}",
-                "Görevin kullanıcının isteğine dayalı olarak detaylı, yapılandırılmış bir eylem planı oluşturmaktır.",
-                "Planı şu yapıda oluştur:",
-                "1. ARAŞTIRMA_AŞAMASI: Pazar araştırması için 3-4 spesifik Google arama sorgusu oluştur",
-                "2. ANALİZ_AŞAMASI: Toplanan verilerden hangi yönlerin analiz edileceğini tanımla. Toplam 3 analiz noktası olmalı. Her analiz noktası 5-6 kelimelik ve temel olmalı.",
-                "Yanıtını şu anahtarları içeren JSON yapısı olarak formatla:",
-                "- research_queries: arama sorgusu dizileri",
-                "- analysis_focus: analiz noktaları dizisi",
-                "Planı kapsamlı ama uygulanabilir yap. İş zekası toplamaya odaklan.",
-                "SADECE JSON yapısı ile yanıtla, ek metin ekleme."
-            ],
+@app.route('/generate-plan/stream', methods=['POST'])
+def generate_plan_stream_endpoint():
+    data = request.json
+    user_message = data.get('message')
+    if not user_message:
+        return jsonify({'error': 'Message cannot be empty'}), 400
+
+    session_id = str(uuid.uuid4())
+    try:
+        job = plan_jobs.submit(
+            'generate-plan',
+            lambda job: generate_plan(user_message, session_id, emit=job.emit, use_cache=_plan_cache_requested(data)),
             session_id=session_id,
-            knowledge=knowledge_base,
-            debug_mode=True
         )
-
-        response = await planning_agent.arun(user_message)
-        
-        try:
-            # Try to parse the response as JSON
-            import json
-            plan_data = json.loads(response.content)
-            
-            return jsonify({
-                'success': True,
-                'plan': plan_data,
-                'session_id': session_id,
-                'message': 'Action plan generated successfully. Please review and modify as needed.'
-            })
-        except json.JSONDecodeError:
-            # If not valid JSON, return as structured text
-            return jsonify({
-                'success': True,
-                'plan': {
-                    'raw_plan': response.content,
-                    'research_queries': [],
-                    'analysis_focus': []
-                },
-                'session_id': session_id,
-                'message': 'Plan generated. Please structure the plan data manually.'
-            })
-        
-    return asyncio.run(_run())
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    return sse_response(job)
 
 # Phase 2: Execution Agent - Executes the approved plan without human intervention
-@app.route('/execute-plan', methods=['POST'])
-def execute_plan_endpoint():
-    data = request.json
-    plan = data.get('plan')
-    if not plan:
-        return jsonify({'error': 'Plan cannot be empty'}), 400
-        
+def sanitize_plan(plan: dict) -> dict:
+    """Frontend'den gelen planı temizler: sorgular, analiz odakları ve 3 çıktı dosyası."""
     # Sanitize queries and analysis focus: trim, remove empty, de-duplicate, cap to 5
     raw_queries = plan.get('research_queries', []) if isinstance(plan, dict) else []
     queries = []
@@ -185,136 +684,139 @@ def execute_plan_endpoint():
     raw_output_format = plan.get('output_format') if isinstance(plan, dict) else None
     files = []
     if isinstance(raw_output_format, str):
-        files = [s.strip() for s in raw_output_format.split('\n') if s and s.strip()]
+        # Yalnızca dosya adı kabul edilir; çalıştırma dizininin dışına yazılamaz
+        files = [Path(s.strip()).name for s in raw_output_format.split('\n') if s and s.strip()]
+        files = [f for f in files if f not in ('', '.', '..')]
     # Ensure exactly three filenames
     if not files:
         files = default_files
     else:
         files = (files + default_files)[:3]
 
-    sanitized_plan = {
+    return {
         'research_queries': queries,
         'analysis_focus': focuses,
         'output_files': files
     }
-    
-    session_id = str(uuid.uuid4())
-    user_id = f"user_{session_id}"
 
-    async def _run():
-        async with MCPTools(f"npx -y @modelcontextprotocol/server-filesystem {OUTPUT_DIR.resolve()}", timeout_seconds=10) as fs_tools:
-            # 1. Araştırma ve Toplama Ajanı
-            searcher = Agent(
-                name="Araştırmacı",
-                model=OpenAIChat(id="gpt-4o-mini"),
-                tools=[GoogleSearchTools()],
-                knowledge=knowledge_base,
-                instructions=[
-                    "Sen bir Araştırmacısın. Verilen arama sorgularını çalıştırıp URL'leri toplarsın.",
-                    "FRAGMAN: Her sorgu için ÖNCE bilgi tabanında (KB) arama yap; ilgili bulguları kısa maddelerle özetle ve kaynak dosya adlarını belirt. Ardından Google araması yap.",
-                    "Frontend'de onaylanan arama sorgularını esas alarak en etkin arama sorgularını oluştur",
-                    "Toplam arama sorgusu 3'ü GEÇMEMELİ. Fazlaysa en alakalı 3'ünü seç ve yalnızca onlar için sonuç topla.",
-                    "Her sorgu için en alakalı 2 URL bul ve listele.",
-                    "YASAK: Öneri yapma, izin isteme, yorum ekleme.",
-                ],
-                markdown=True,
-                debug_mode=True
-            )
-            
-            # 2. İçerik Okuma Ajanı  
-            reader = Agent(
-                name="İçerik Okuyucu",
-                model=OpenAIChat(id="gpt-4o-mini"),
-                tools=[read_articles],
-                instructions=[
-                    "Sen bir İçerik Okuyucusun. Verilen URL'lerdeki içerikleri okur ve özetlersin.",
-                    "Her URL'yi ayrı ayrı oku ve en fazla 5 maddede, toplam 400-600 karakterlik sıkıştırılmış özet çıkar.",
-                    "YASAK: Öneri sunma, izin isteme.",
-                ],
-                markdown=True,
-                debug_mode=True
-            )
-            
-            # 3. Analiz Ajanı
-            analyzer = Agent(
-                name="Analist",
-                model=OpenAIChat(id="gpt-4o-mini"),
-                tools=[],
-                instructions=[
-                    "Sen bir İş Analistisisin. Verilen içerikleri analiz eder ve bulgularını raporlarsın.",
-                    "Pazar trendleri, fırsatlar ve rakip analizi yap.",
-                    "YASAK: Ek öneri sunma, izin isteme, yorum ekleme.",
-                ],
-                markdown=True,
-                debug_mode=True
-            )
-            
-            # 4. İş Planı ve Strateji Uzmanı
-            file1, file2, file3 = sanitized_plan['output_files']
-            proposer_instructions = [
-                "Rol: İş Stratejisti. Türkçe yaz. 3 dosya üret ve kaydet: 'output/{file1}', 'output/{file2}', 'output/{file3}'.",
-                "Genel: Paragraf ağırlıklı, kısa cümleler; jargon ilk geçtiğinde açıkla; onay/öneri isteme; süreç anlatma.",
-                f"1) 'output/{file1}' (pain_points.md): Giriş paragrafı; 3-5 acı noktası (problem, iş etkisi, kanıt); fırsat çerçevesi; küçük KPI tablosu (KPI | mevcut | hedef).",
-                f"2) 'output/{file2}' (roadmap.md): KULLANICININ DANIŞTIĞI ÜRÜNÜN ROADMAP'i. Markdown TABLO ZORUNLU. Başlıklar AYNEN: Sprint/Release | Epic/Feature | User Story/Kapsam | Aşama (Discovery, Design, Build, Test, Launch) | Sorumlu (kişi/ekip) | Başlangıç (YYYY-MM-DD) | Bitiş (YYYY-MM-DD) | Öncelik (Yüksek/Orta/Düşük) | Bağımlılıklar | KPI/Metrik (ör. aktivasyon oranı, NPS, hata oranı). En az 5-8 satır. Aşağıdaki TERİMLER GEÇMEYECEK: Araştırmacı, İçerik Okuyucu, Analist, İş Planı Uzmanı, Koordinatör, ajan, adım, süreç, araştırma, okuma, analiz, ekip, team, koordine, koordinatör. Sadece ürün/feature planı.",
-                f"3) 'output/{file3}' (business_strategy.md): Önerilen bölümler: Yönetsel Özet; Analiz Bulguları; Değer Önerisi ve Ürün Stratejisi; Go-to-Market ve Büyüme; Zaman Çizelgesi Özeti; Riskler ve Önlemler; KPI ve Hedefler; Sonraki Adım.",
-                "Kayıt: write_file aracıyla kaydet."
-            ]
-            proposer = Agent(
-                name="İş Planı Uzmanı",
-                model=OpenAIChat(id="gpt-4o-mini"),
-                tools=[fs_tools],
-                instructions=proposer_instructions,
-                markdown=True,
-                debug_mode=True
-            )
-            
-            # Takım Koordinatörü
-            team_instructions = [
-                "Sen bir Proje Koordinatörüsün. Takımı yönetir ve görevleri sırayla dağıtırsın.",
-                "",
-                "Eğer kullanıcı yeni bir projeye başlamak istiyorsa şu adımları takip et:",
-                "0. Her arama sorgusu için ÖNCE bilgi tabanında (KB) ilgili içerik var mı diye ara ve bulguları not et; ardından web araması yap.",
-                "1. Araştırmacı'ya arama sorgularını ver. Her arama sorgusu için en alakalı 3 URL bulmalı.",
-                "2. İçerik Okuyucu'ya URL'leri ver", 
-                "3. Analist'e içerikleri analiz ettir",
-                "4. İş Planı Uzmanı'na 3 dosyayı hazırlat",
-                "5. Oluşturulan 3 dosyayı oku ve özetle",
-                "",
-                "ÇIKTI: 3 dosyanın içeriğini şu dosyalardan oku ve aynen paylaş:",
-                f"- output/{file1}",
-                f"- output/{file2}",
-                f"- output/{file3}",
-                "",
-                "Her dosyayı read_file ile oku ve aynen döndür.",
-                "",
-                "Kullanıcının yeni proje geliştirme talepleri dışındaki sorulara, takım dinamiklerini aklında bulundurarak kendin karar ver.",
-                "",
-                "YASAK: Kendi metin üretme, süreç anlatma, izin isteme, öneri yapma. Sadece son çıktıyı paylaş.",
-            ]
-
-            analysis_team = Team(
-                name="İş Strateji Takımı",
-                mode="coordinate",
-                model=OpenAIChat(id="gpt-4o-mini"),
-                members=[searcher, reader, analyzer, proposer],
-                tools=[fs_tools],
-                user_id=user_id,
-                session_id=session_id,
-                description=(
-                    "Sen bir Proje Koordinatörüsün. Takımı yönetir ve verilen planı uygularsın."
-                ),
-                instructions=team_instructions,
-                add_datetime_to_instructions=False,
-                enable_agentic_context=False,
-                share_member_interactions=False,
-                markdown=True,
-                debug_mode=True,
-                knowledge=knowledge_base,
-                search_knowledge=True,
-            )
+ANALYST_INSTRUCTIONS = [
+    "Sen bir İş Analistisisin. Verilen içerikleri analiz eder ve bulgularını raporlarsın.",
+    "Pazar trendleri, fırsatlar ve rakip analizi yap.",
+    "YASAK: Ek öneri sunma, izin isteme, yorum ekleme.",
+]
+
+DOCUMENT_GENERAL_INSTRUCTION = "Genel: Paragraf ağırlıklı, kısa cümleler; jargon ilk geçtiğinde açıkla; onay/öneri isteme; süreç anlatma."
+DOCUMENT_INSTRUCTIONS = [
+    "1) '{path1}' (pain_points.md): Giriş paragrafı; 3-5 acı noktası (problem, iş etkisi, kanıt); fırsat çerçevesi; küçük KPI tablosu (KPI | mevcut | hedef).",
+    "2) '{path2}' (roadmap.md): KULLANICININ DANIŞTIĞI ÜRÜNÜN ROADMAP'i. Markdown TABLO ZORUNLU. Başlıklar AYNEN: Sprint/Release | Epic/Feature | User Story/Kapsam | Aşama (Discovery, Design, Build, Test, Launch) | Sorumlu (kişi/ekip) | Başlangıç (YYYY-MM-DD) | Bitiş (YYYY-MM-DD) | Öncelik (Yüksek/Orta/Düşük) | Bağımlılıklar | KPI/Metrik (ör. aktivasyon oranı, NPS, hata oranı). En az 5-8 satır. Aşağıdaki TERİMLER GEÇMEYECEK: Araştırmacı, İçerik Okuyucu, Analist, İş Planı Uzmanı, Koordinatör, ajan, adım, süreç, araştırma, okuma, analiz, ekip, team, koordine, koordinatör. Sadece ürün/feature planı.",
+    "3) '{path3}' (business_strategy.md): Önerilen bölümler: Yönetsel Özet; Analiz Bulguları; Değer Önerisi ve Ürün Stratejisi; Go-to-Market ve Büyüme; Zaman Çizelgesi Özeti; Riskler ve Önlemler; KPI ve Hedefler; Sonraki Adım.",
+]
+
+def build_document_instructions(path1: str, path2: str, path3: str) -> tuple[str, list[str]]:
+    """İş Planı Uzmanı'nın genel talimatı ve dosya başına doküman talimatları."""
+    return DOCUMENT_GENERAL_INSTRUCTION, [t.format(path1=path1, path2=path2, path3=path3) for t in DOCUMENT_INSTRUCTIONS]
 
-            # Convert plan to a readable format for the team
-            plan_text = f"""
+# --- Agent & team templates ---
+# Talimatlar bir kez tanımlanır; {today}, {path1} gibi yer tutucular çalıştırma başına doldurulur.
+PLANNER_INSTRUCTIONS = [
+    "Sen iş araştırması ve teklif oluşturma için Stratejik Planlama Ajanısın. Bugünün tarihi: {today}",
+    "Görevin kullanıcının isteğine dayalı olarak detaylı, yapılandırılmış bir eylem planı oluşturmaktır.",
+    "Planı şu yapıda oluştur:",
+    "1. ARAŞTIRMA_AŞAMASI: Pazar araştırması için 3-4 spesifik Google arama sorgusu oluştur",
+    "2. ANALİZ_AŞAMASI: Toplanan verilerden hangi yönlerin analiz edileceğini tanımla. Toplam 3 analiz noktası olmalı. Her analiz noktası 5-6 kelimelik ve temel olmalı.",
+    "Yanıtını şu anahtarları içeren JSON yapısı olarak formatla:",
+    "- research_queries: arama sorgusu dizileri",
+    "- analysis_focus: analiz noktaları dizisi",
+    "Planı kapsamlı ama uygulanabilir yap. İş zekası toplamaya odaklan.",
+    "SADECE JSON yapısı ile yanıtla, ek metin ekleme."
+]
+SEARCHER_INSTRUCTIONS = [
+    "Sen bir Araştırmacısın. Verilen arama sorgularını çalıştırıp URL'leri toplarsın.",
+    "FRAGMAN: Her sorgu için ÖNCE bilgi tabanında (KB) arama yap; ilgili bulguları kısa maddelerle özetle ve kaynak dosya adlarını belirt. Ardından Google araması yap.",
+    "Frontend'de onaylanan arama sorgularını esas alarak en etkin arama sorgularını oluştur",
+    "Toplam arama sorgusu 3'ü GEÇMEMELİ. Fazlaysa en alakalı 3'ünü seç ve yalnızca onlar için sonuç topla.",
+    "Her sorgu için en alakalı 2 URL bul ve listele.",
+    "YASAK: Öneri yapma, izin isteme, yorum ekleme.",
+]
+READER_INSTRUCTIONS = [
+    "Sen bir İçerik Okuyucusun. Verilen URL'lerdeki içerikleri okur ve özetlersin.",
+    "Her URL'yi ayrı ayrı oku ve en fazla 5 maddede, toplam 400-600 karakterlik sıkıştırılmış özet çıkar.",
+    "YASAK: Öneri sunma, izin isteme.",
+]
+PROPOSER_INSTRUCTIONS = [
+    "Rol: İş Stratejisti. Türkçe yaz. 3 dosya üret ve kaydet: '{path1}', '{path2}', '{path3}'.",
+    DOCUMENT_GENERAL_INSTRUCTION,
+    DOCUMENT_INSTRUCTIONS,
+    "Kayıt: write_file aracıyla kaydet."
+]
+WRITER_INSTRUCTIONS = [
+    "Rol: İş Stratejisti. Türkçe yaz.",
+    DOCUMENT_GENERAL_INSTRUCTION,
+    "{instruction}",
+    "ÇIKTI: Yalnızca dokümanın tam markdown içeriğini döndür; dosya yolu, açıklama veya ek metin ekleme.",
+]
+ROADMAP_ROW_REPAIR_INSTRUCTIONS = [
+    "Rol: Ürün roadmap editörü. Türkçe yaz.",
+    "Sana bir roadmap tablosunun yalnızca hatalı satırları ve her satırın hataları verilir.",
+    "Yalnızca belirtilen hataları düzelt; diğer hücreleri olduğu gibi bırak.",
+    "ÇIKTI: Başlık satırı dahil yalnızca markdown tablo döndür; satır sayısını ve sırasını koru, açıklama ekleme.",
+]
+TEAM_INSTRUCTIONS = [
+    "Sen bir Proje Koordinatörüsün. Takımı yönetir ve görevleri sırayla dağıtırsın.",
+    "",
+    "Eğer kullanıcı yeni bir projeye başlamak istiyorsa şu adımları takip et:",
+    "0. Her arama sorgusu için ÖNCE bilgi tabanında (KB) ilgili içerik var mı diye ara ve bulguları not et; ardından web araması yap.",
+    "1. Araştırmacı'ya arama sorgularını ver. Her arama sorgusu için en alakalı 3 URL bulmalı.",
+    "2. İçerik Okuyucu'ya URL'leri ver",
+    "3. Analist'e içerikleri analiz ettir",
+    "4. İş Planı Uzmanı'na 3 dosyayı hazırlat",
+    "5. Oluşturulan 3 dosyayı oku ve özetle",
+    "",
+    "ÇIKTI: 3 dosyanın içeriğini şu dosyalardan oku ve aynen paylaş:",
+    "- {path1}",
+    "- {path2}",
+    "- {path3}",
+    "",
+    "Her dosyayı read_file ile oku ve aynen döndür.",
+    "",
+    "Kullanıcının yeni proje geliştirme talepleri dışındaki sorulara, takım dinamiklerini aklında bulundurarak kendin karar ver.",
+    "",
+    "YASAK: Kendi metin üretme, süreç anlatma, izin isteme, öneri yapma. Sadece son çıktıyı paylaş.",
+]
+
+def _build_templates(_, agno, openai_http_client):
+    templates = TemplateRegistry(
+        agno.Agent, agno.Team,
+        # Her ajana yeni bir model nesnesi, ama hepsi aynı httpx bağlantı havuzunu kullanır
+        lambda model_id: agno.OpenAIChat(
+            id=model_id, http_client=openai_http_client, timeout=OPENAI_TIMEOUT, max_retries=OPENAI_MAX_RETRIES,
+        ),
+        debug_mode=AGENT_DEBUG,
+    )
+    templates.register(AgentTemplate('planner', PLANNER_INSTRUCTIONS, tools=[]))  # Planning agent doesn't need external tools
+    # agent_id, koordinatörün üyeye devrederken kullandığı member_id'dir (TEAM_MEMBER_STAGES)
+    templates.register(AgentTemplate('searcher', SEARCHER_INSTRUCTIONS, name="Araştırmacı", markdown=True, agent_id='searcher'))
+    templates.register(AgentTemplate('reader', READER_INSTRUCTIONS, name="İçerik Okuyucu", markdown=True, agent_id='reader'))
+    templates.register(AgentTemplate('analyst', ANALYST_INSTRUCTIONS, name="Analist", tools=[], markdown=True, agent_id='analyst'))
+    templates.register(AgentTemplate('proposer', PROPOSER_INSTRUCTIONS, name="İş Planı Uzmanı", markdown=True, agent_id='proposer'))
+    templates.register(AgentTemplate('writer', WRITER_INSTRUCTIONS, name="İş Planı Uzmanı", tools=[], markdown=True))
+    templates.register(AgentTemplate('roadmap_rows', ROADMAP_ROW_REPAIR_INSTRUCTIONS, name="Roadmap Editörü", tools=[], markdown=True))
+    templates.register(AgentTemplate(
+        'team', TEAM_INSTRUCTIONS, name="İş Strateji Takımı", team=True,
+        mode="coordinate",
+        description="Sen bir Proje Koordinatörüsün. Takımı yönetir ve verilen planı uygularsın.",
+        add_datetime_to_instructions=False,
+        enable_agentic_context=False,
+        share_member_interactions=False,
+        markdown=True,
+        search_knowledge=True,
+    ))
+    return templates
+
+components.register('agent_templates', lambda: None, _build_templates, deps=('agno', 'openai_http_client'))
+
+def format_plan_text(sanitized_plan: dict) -> str:
+    return f"""
 UYGULAMA PLANI:
 
 ARAŞTIRMA SORGULARİ:
@@ -326,95 +828,741 @@ ANALİZ ODAKLARI:
 ÇIKTI FORMATI: 3 dosya ({', '.join(sanitized_plan.get('output_files', []))})
 """
 
-            response = await analysis_team.arun(f"Bu araştırma ve analiz planını takımımla birlikte tamamen uygula:\n{plan_text}")
-            
-            # Read generated output files and include them as structured documents
-            documents = []
+def read_workspace_documents(workspace, file_names: list[str]) -> list[dict]:
+    """Çalıştırma dizinindeki çıktı dosyalarını yapılandırılmış doküman olarak okur."""
+    # Read generated output files and include them as structured documents
+    documents = []
+    try:
+        for fname in file_names:
+            file_path = workspace.file(fname)
             try:
-                output_files = sanitized_plan.get('output_files', [])
-                for fname in output_files:
-                    file_path = OUTPUT_DIR / fname
-                    try:
-                        content = file_path.read_text(encoding='utf-8')
-                    except FileNotFoundError:
-                        content = f"Dosya bulunamadı: {file_path}"
-                    except Exception as e:
-                        content = f"Dosya okunurken hata oluştu ({file_path}): {str(e)}"
-                    documents.append({
-                        'filename': str(fname),
-                        'content': content
-                    })
+                content = file_path.read_text(encoding='utf-8')
+            except FileNotFoundError:
+                content = f"Dosya bulunamadı: {file_path}"
             except Exception as e:
-                documents = [{
-                    'filename': 'error',
-                    'content': f'Dokümanları okurken beklenmeyen bir hata oluştu: {str(e)}'
-                }]
-            
-            # Roadmap doğrulama ve gerekirse yeniden yazdırma
+                content = f"Dosya okunurken hata oluştu ({file_path}): {str(e)}"
+            documents.append({
+                'filename': str(fname),
+                'content': content
+            })
+    except Exception as e:
+        documents = [{
+            'filename': 'error',
+            'content': f'Dokümanları okurken beklenmeyen bir hata oluştu: {str(e)}'
+        }]
+    return documents
+
+def _refresh_document(documents: list[dict], name: str, content: str):
+    for d in documents:
+        if d.get('filename') == str(name):
+            d['content'] = content
+            break
+
+async def validate_and_repair_roadmap(sanitized_plan: dict, workspace, documents: list[dict], written: dict,
+                                      emit, rewrite, action_lines: str) -> bool:
+    """Roadmap tablosunu yapısal olarak doğrular ve en ucuz yoldan onarır.
+
+    Önce mekanik sorunlar yerelde düzeltilir (başlıklar, Aşama/Öncelik yazımı, tarih biçimi);
+    kalan satır hataları için LLM'den yalnızca o satırlar istenir. Yapı bozuksa (tablo, başlık,
+    satır sayısı) ya da satır onarımı sonuç vermezse `rewrite(fix_prompt)` ile dosya yeniden yazdırılır.
+    Roadmap sonunda geçerliyse True döner; onarım başarısız olursa ya da hata oluşursa False.
+    """
+    try:
+        roadmap_name = sanitized_plan.get('output_files', [None, None, None])[1]
+        if not roadmap_name:
+            return True
+        roadmap_path = workspace.file(roadmap_name)
+        try:
+            content = roadmap_path.read_text(encoding='utf-8')
+        except Exception:
+            content = ""
+
+        violations = roadmap.validate(content)
+        trace = current_trace.get()
+        if not violations:
+            metrics.inc('roadmap_checks_total', result='valid')
+            return True
+        if trace is not None:
+            trace.incr('roadmap_repairs')
+        for violation in violations:
+            metrics.inc('roadmap_violations_total', code=violation.code)
+        emit('roadmap_violations', {'filename': str(roadmap_name), 'violations': [v.to_dict() for v in violations]})
+
+        async def store(text: str):
+            await asyncio.to_thread(roadmap_path.write_text, text, encoding='utf-8')
+            emit_written_documents(workspace.path, [roadmap_name], written, emit)
+            _refresh_document(documents, roadmap_name, text)
+
+        # 1. Mekanik düzeltmeler: LLM çağrısı yok
+        fixed, fixes = roadmap.normalize(content)
+        if fixes:
+            content = fixed
+            violations = roadmap.validate(content)
+            emit('roadmap_repair', {'filename': str(roadmap_name), 'strategy': 'local', 'fixes': fixes})
+            await store(content)
+            if trace is not None:
+                trace.incr('roadmap_local_fixes')
+            if not violations:
+                metrics.inc('roadmap_checks_total', result='fixed_locally')
+                return True
+
+        # 2. Yalnızca hatalı satırlar LLM'e gönderilir
+        if not roadmap.needs_regeneration(violations) and roadmap.offending_rows(violations):
+            rows = roadmap.offending_rows(violations)
+            emit('roadmap_repair', {'filename': str(roadmap_name), 'strategy': 'rows', 'rows': rows})
+            merged = None
             try:
-                roadmap_name = sanitized_plan.get('output_files', [None, None, None])[1]
-                if roadmap_name:
-                    roadmap_path = OUTPUT_DIR / roadmap_name
-                    roadmap_content = ""
-                    try:
-                        roadmap_content = roadmap_path.read_text(encoding='utf-8')
-                    except Exception:
-                        roadmap_content = ""
-
-                    banned_terms = [
-                        "Araştırmacı", "İçerik Okuyucu", "Analist", "İş Planı Uzmanı", "Koordinatör",
-                        "ajan", "adım", "süreç", "araştırma", "okuma", "analiz", "ekip", "team", "koordine", "koordinatör"
-                    ]
-                    required_headers = [
-                        "Sprint/Release", "Epic/Feature", "User Story/Kapsam", "Aşama", "Sorumlu",
-                        "Başlangıç", "Bitiş", "Öncelik", "Bağımlılıklar", "KPI/Metrik"
-                    ]
-
-                    def is_invalid_roadmap(text: str) -> bool:
-                        lower = text.lower()
-                        has_banned = any(term.lower() in lower for term in banned_terms)
-                        has_table = "|" in text and "---" in text
-                        has_all_headers = all(h in text for h in required_headers)
-                        return (not has_table) or (not has_all_headers) or has_banned
-
-                    if is_invalid_roadmap(roadmap_content):
-                        fix_prompt = dedent(f"""
-                        'output/{roadmap_name}' dosyası ürün ROADMAP'ı formatında DEĞİL. Şimdi yalnızca bu dosyayı yeniden yaz.
-                        ZORUNLU:
-                        - .md TABLO kullan
-                        - Sütun başlıkları AYNEN: Sprint/Release | Epic/Feature | User Story/Kapsam | Aşama (Discovery, Design, Build, Test, Launch) | Sorumlu (kişi/ekip) | Başlangıç (YYYY-MM-DD) | Bitiş (YYYY-MM-DD) | Öncelik (Yüksek/Orta/Düşük) | Bağımlılıklar | KPI/Metrik (ör. aktivasyon oranı, NPS, hata oranı)
-                        - En az 5-8 satır
-                        - Aşağıdaki terimleri ve ajan süreçlerini KULLANMA: {', '.join(banned_terms)}
-                        - Yalnızca ürün, özellikler, kullanıcı hikayeleri ve teslimat planına odaklan
-                        EYLEM:
-                        - Doğru içerikle 'output/{roadmap_name}' dosyasını yaz (write_file aracıyla) ve kaydet
-                        - Başka metin döndürme
-                        """)
-                        try:
-                            await proposer.arun(fix_prompt)
-                            # Dosyayı tekrar oku ve documents içine güncellenmiş halini yansıt
-                            try:
-                                corrected = roadmap_path.read_text(encoding='utf-8')
-                                for d in documents:
-                                    if d.get('filename') == str(roadmap_name):
-                                        d['content'] = corrected
-                                        break
-                            except Exception:
-                                pass
-                        except Exception:
-                            pass
+                editor = (await components.aget('agent_templates')).build('roadmap_rows')
+                repaired = await run_agent_streamed(editor, roadmap.row_repair_prompt(content, violations), emit)
+                merged = roadmap.replace_rows(content, rows, repaired)
             except Exception:
-                pass
-            
-            return jsonify({
-                'success': True,
-                'result': response.content,
-                'documents': documents,
-                'session_id': session_id,
-                'message': 'Plan takım tarafından başarıyla uygulandı. İş stratejisi tamamlandı ve kaydedildi.'
-            })
-            
-    return asyncio.run(_run())
+                merged = None
+            if merged is not None:
+                merged = roadmap.normalize(merged)[0]
+                if not roadmap.validate(merged):
+                    await store(merged)
+                    metrics.inc('roadmap_checks_total', result='rows_repaired')
+                    if trace is not None:
+                        trace.incr('roadmap_row_repairs')
+                    return True
+
+        # 3. Son çare: tüm dosyanın yeniden üretilmesi
+        reason = 'structure' if roadmap.needs_regeneration(violations) else 'rows_unresolved'
+        metrics.inc('roadmap_regenerations_total', reason=reason)
+        if trace is not None:
+            trace.incr('roadmap_regenerations')
+        problems = '\n'.join(f"- {f'Satır {v.row}: ' if v.row else ''}{v.message}" for v in violations[:10])
+        fix_prompt = dedent(f"""
+        '{roadmap_path}' dosyası ürün ROADMAP'ı formatında DEĞİL. Şimdi yalnızca bu dosyayı yeniden yaz.
+        ZORUNLU:
+        - .md TABLO kullan
+        - Sütun başlıkları AYNEN: {' | '.join(ROADMAP_HEADERS)}
+        - En az {roadmap.ROADMAP_MIN_ROWS}-8 satır
+        - Tarihler YYYY-MM-DD, Başlangıç <= Bitiş
+        - Aşağıdaki terimleri ve ajan süreçlerini KULLANMA: {', '.join(ROADMAP_BANNED_TERMS)}
+        - Yalnızca ürün, özellikler, kullanıcı hikayeleri ve teslimat planına odaklan
+        """) + f"BULUNAN HATALAR:\n{problems}\nEYLEM:\n" + action_lines.format(path=roadmap_path)
+        try:
+            emit('roadmap_repair', {'filename': str(roadmap_name), 'strategy': 'regenerate', 'reason': reason})
+            await rewrite(fix_prompt, roadmap_path)
+            emit_written_documents(workspace.path, [roadmap_name], written, emit)
+        except Exception:
+            metrics.inc('roadmap_checks_total', result='repair_failed')
+            return False
+        # Yeniden üretilen dosya da doğrulanır; sonuç metriklere ve olaylara yansır
+        try:
+            corrected = roadmap_path.read_text(encoding='utf-8')
+        except Exception:
+            corrected = ""
+        normalized, fixes = roadmap.normalize(corrected)
+        if fixes:
+            await store(normalized)
+        else:
+            _refresh_document(documents, roadmap_name, corrected)
+        remaining = roadmap.validate(normalized)
+        if not remaining:
+            metrics.inc('roadmap_checks_total', result='regenerated')
+            return True
+        metrics.inc('roadmap_checks_total', result='regenerated_invalid')
+        emit('roadmap_invalid', {'filename': str(roadmap_name), 'violations': [v.to_dict() for v in remaining]})
+        return False
+    except Exception:
+        return False
+
+async def run_agent_streamed(agent, prompt: str, emit) -> str:
+    """Ajanı akış modunda çalıştırır, olayları yayar ve yanıt metnini döndürür."""
+    stream = await agent.arun(prompt, stream=True, stream_intermediate_steps=True)
+    content = await consume_run_stream(stream, emit, source=agent.name)
+    run_response = getattr(agent, 'run_response', None)
+    record_usage(agent.name, run_response)
+    if getattr(run_response, 'content', None):
+        content = run_response.content
+    return content or ''
+
+async def execute_plan(sanitized_plan: dict, session_id: str, user_id: str, emit=_noop_emit,
+                       mode: str | None = None) -> dict:
+    """Onaylanmış planı seçilen modda (coordinate/pipeline) uygular ve üretilen dokümanları döndürür.
+
+    Her aşamanın çıktısı oturumun çalıştırma dizinine kaydedilir; aynı session_id ile tekrar
+    çağrıldığında tamamlanmış aşamalar atlanır.
+    """
+    mode = mode if mode in EXECUTION_MODES else EXECUTION_MODE
+    workspace = workspaces.create(session_id)
+    checkpoints = CheckpointStore(workspace.path / "checkpoints")
+    finished = checkpoints.load('result')
+    if finished is not None:
+        emit('stage_skipped', {'stage': 'result'})
+        return finished
+    if not checkpoints.has('plan'):
+        checkpoints.save('plan', {'plan': sanitized_plan, 'user_id': user_id, 'mode': mode})
+    resumed_stages = [c['stage'] for c in checkpoints.completed() if c['stage'] != 'plan']
+    emit('run_started', {'session_id': session_id, 'mode': mode, 'resumed_stages': resumed_stages})
+
+    trace = RunTrace(session_id, mode=mode, resumed_stages=resumed_stages)
+    current_trace.set(trace)
+    run_focus.set(tuple(sanitized_plan.get('analysis_focus', [])) + tuple(sanitized_plan.get('research_queries', [])))
+    status = 'failed'
+    try:
+        if mode == 'pipeline':
+            result_content, documents = await execute_plan_pipeline(sanitized_plan, workspace, checkpoints, emit)
+        else:
+            result_content, documents = await execute_plan_team(sanitized_plan, workspace, checkpoints, session_id, user_id, emit)
+        status = 'succeeded'
+    except asyncio.CancelledError:
+        status = 'cancelled'
+        raise
+    finally:
+        trace.finish(status)
+        metrics.observe('run_seconds', trace.finished_at - trace.started_at, mode=mode, status=status)
+        try:
+            trace.save(workspace.file('trace.json'))
+        except OSError:
+            pass
+    result = {
+        'success': True,
+        'result': result_content,
+        'documents': documents,
+        'session_id': session_id,
+        'mode': mode,
+        'message': 'Plan takım tarafından başarıyla uygulandı. İş stratejisi tamamlandı ve kaydedildi.'
+    }
+    checkpoints.save('result', result)
+    return result
+
+async def execute_plan_team(sanitized_plan: dict, workspace, checkpoints, session_id: str, user_id: str,
+                            emit) -> tuple[str, list[dict]]:
+    """Koordinatör modu: agno Team üyeler arasında işi sırayla devreder."""
+    templates = await components.aget('agent_templates')
+    # Bilgi tabanı indeksleyici üzerinden alınır ki lazy modda da ilk eşitleme başlasın
+    knowledge_base = (await components.aget('kb_indexer')).knowledge_base
+    make_search_tools = await components.aget('cached_search_tools')
+    read_articles_tool = await components.aget('read_articles_tool')
+    async with acquire_fs_tools(workspace) as fs_tools:
+        file1, file2, file3 = sanitized_plan['output_files']
+        paths = dict(zip(('path1', 'path2', 'path3'), (workspace.display_path(f) for f in (file1, file2, file3))))
+        output_names = sanitized_plan.get('output_files', [])
+        # Önceki denemede tamamlanan üye aşamaları ve yazılmış dosyalar tekrar yapılmaz
+        done = {key: checkpoints.load(stage) for key, (stage, _) in TEAM_MEMBER_STAGES.items()}
+        done = {key: data for key, data in done.items() if data is not None}
+        docs_done = [f for f in output_names if checkpoints.has(f'document-{f}') and workspace.file(f).is_file()]
+
+        members = []
+        # 1. Araştırma ve Toplama Ajanı
+        if 'searcher' not in done:
+            members.append(templates.build('searcher', tools=[make_search_tools()], knowledge=knowledge_base))
+        # 2. İçerik Okuma Ajanı
+        if 'reader' not in done:
+            members.append(templates.build('reader', tools=[read_articles_tool]))
+        # 3. Analiz Ajanı
+        if 'analyst' not in done:
+            members.append(templates.build('analyst'))
+        # 4. İş Planı ve Strateji Uzmanı (roadmap onarımı için her durumda kurulur)
+        proposer = templates.build('proposer', paths, tools=[fs_tools])
+        if len(docs_done) < len(output_names):
+            members.append(proposer)
+        for key in done:
+            emit('stage_skipped', {'stage': TEAM_MEMBER_STAGES[key][0]})
+        for fname in docs_done:
+            emit('stage_skipped', {'stage': f'document-{fname}'})
+
+        # Convert plan to a readable format for the team
+        plan_text = format_plan_text(sanitized_plan)
+        task = f"Bu araştırma ve analiz planını takımımla birlikte tamamen uygula:\n{plan_text}"
+        prior = [f"### {TEAM_MEMBER_STAGES[key][1]}\n{data['output']}" for key, data in done.items()]
+        if docs_done:
+            prior.append("### Kaydedilmiş dosyalar (yeniden yazma)\n" + '\n'.join(f"- {workspace.display_path(f)}" for f in docs_done))
+        if prior:
+            task += "\n\nTAMAMLANMIŞ AŞAMALAR (tekrar yapma, çıktılarını kullan):\n" + '\n\n'.join(prior)
+
+        # Dosyalar yazıldıkça 'document' olayı olarak hemen yayınlanır; üye çıktıları ve yazılan
+        # dosyalar olay akışından checkpoint olarak kaydedilir
+        written = {}
+        searches = []
+
+        def on_tool_completed(tool_name, tool_args, result):
+            if tool_name == 'write_file':
+                emit_written_documents(workspace.path, output_names, written, emit)
+                for fname in output_names:
+                    if fname in written and not checkpoints.has(f'document-{fname}'):
+                        checkpoints.save(f'document-{fname}', {'filename': fname})
+            elif tool_name == 'google_search':
+                searches.append({'query': tool_args.get('query'), 'results': result})
+            elif tool_name in MEMBER_DELEGATION_TOOLS:
+                key = tool_args.get('member_id')
+                if key in TEAM_MEMBER_STAGES and result:
+                    data = {'output': result}
+                    if key == 'searcher':
+                        data['searches'] = list(searches)
+                    checkpoints.save(TEAM_MEMBER_STAGES[key][0], data)
+
+        team_checkpoint = checkpoints.load('team')
+        if team_checkpoint is None and not members:
+            # Tüm üye aşamaları ve dosyalar hazır; koordinatör çalıştırılmadan sonuç dosyalardan derlenir
+            result_content = '\n\n'.join(d['content'] for d in read_workspace_documents(workspace, output_names))
+            checkpoints.save('team', {'result': result_content})
+        elif team_checkpoint is None:
+            # Takım Koordinatörü
+            analysis_team = templates.build(
+                'team', paths,
+                members=members,
+                tools=[fs_tools],
+                user_id=user_id,
+                session_id=session_id,
+                knowledge=knowledge_base,
+            )
+            with metrics.timed('stage_seconds', span='stage', stage='team'):
+                stream = await analysis_team.arun(
+                    task,
+                    stream=True,
+                    stream_intermediate_steps=True,
+                    stream_member_events=True,
+                )
+                result_content = await consume_run_stream(
+                    stream, emit, source=analysis_team.name,
+                    content_event='TeamRunResponseContent', on_tool_completed=on_tool_completed,
+                )
+            run_response = getattr(analysis_team, 'run_response', None)
+            record_usage(analysis_team.name, run_response)
+            for member_response in getattr(run_response, 'member_responses', None) or []:
+                record_usage(getattr(member_response, 'agent_name', None) or 'member', member_response)
+            if getattr(run_response, 'content', None):
+                result_content = run_response.content
+            checkpoints.save('team', {'result': result_content})
+        else:
+            result_content = team_checkpoint['result']
+            emit('stage_skipped', {'stage': 'team'})
+        emit_written_documents(workspace.path, output_names, written, emit)
+
+        documents = read_workspace_documents(workspace, output_names)
+
+        async def rewrite_with_proposer(fix_prompt, roadmap_path):
+            await proposer.arun(fix_prompt)
+
+        if not checkpoints.has('roadmap'):
+            with metrics.timed('stage_seconds', span='stage', stage='roadmap'):
+                validated = await validate_and_repair_roadmap(
+                    sanitized_plan, workspace, documents, written, emit, rewrite_with_proposer,
+                    action_lines="- Doğru içerikle '{path}' dosyasını yaz (write_file aracıyla) ve kaydet\n- Başka metin döndürme\n",
+                )
+            # Yalnızca doğrulanmış roadmap kaydedilir; aksi halde devam ettirmede tekrar denenir
+            if validated:
+                checkpoints.save('roadmap', {'validated': True})
+        return result_content, documents
+
+async def execute_plan_pipeline(sanitized_plan: dict, workspace, checkpoints, emit) -> tuple[str, list[dict]]:
+    """Pipeline modu: tüm sorgular eşzamanlı aranır, URL'ler tekilleştirilip tek seferde okunur,
+    tek bir analiz üretilir ve üç doküman bu analizden paralel olarak yazılır."""
+    templates = await components.aget('agent_templates')
+    knowledge_base = (await components.aget('kb_indexer')).knowledge_base
+    # Sorgular eşzamanlı aranır; araç içi tekilleştirme hangi sorgunun URL'yi alacağını thread
+    # sırasına bağlardı, tekilleştirme aşağıda sorgu sırasıyla yapılır
+    search_tools = (await components.aget('cached_search_tools'))(dedupe=False)
+    queries = sanitized_plan.get('research_queries', [])
+    focuses = sanitized_plan.get('analysis_focus', [])
+    output_names = sanitized_plan.get('output_files', [])
+
+    # 1. KB ve web aramaları: tüm sorgular için eşzamanlı
+    emit('stage', {'stage': 'search', 'queries': queries})
+
+    async def search(query: str) -> list[dict]:
+        try:
+            with metrics.timed('tool_call_seconds', span='tool', tool='google_search'):
+                raw = await asyncio.to_thread(search_tools.google_search, query, max_results=5, language=PIPELINE_SEARCH_LANGUAGE)
+            results = json.loads(raw) if isinstance(raw, str) else (raw or [])
+        except Exception as e:
+            emit('search_error', {'query': query, 'error': str(e)})
+            return []
+        results = [r for r in results if isinstance(r, dict) and r.get('url')]
+        emit('search_results', {'query': query, 'results': results})
+        return results
+
+    async def search_kb(query: str) -> list[tuple[str, str]]:
+        try:
+            with metrics.timed('kb_query_seconds', span='kb_query'):
+                docs = await asyncio.to_thread(knowledge_base.search, query, num_documents=3)
+        except Exception:
+            return []
+        return [(getattr(d, 'name', None) or 'kb', getattr(d, 'content', '') or '') for d in docs or []]
+
+    searched = checkpoints.load('search')
+    if searched is None:
+        with metrics.timed('stage_seconds', span='stage', stage='search'):
+            web_results, kb_results = await asyncio.gather(
+                asyncio.gather(*(search(q) for q in queries)),
+                asyncio.gather(*(search_kb(q) for q in queries)),
+            )
+        checkpoints.save('search', {'web_results': web_results, 'kb_results': kb_results})
+    else:
+        web_results, kb_results = searched['web_results'], searched['kb_results']
+        emit('stage_skipped', {'stage': 'search'})
+
+    # 2. Sorgular arası URL tekilleştirme ve tek toplu okuma
+    urls, seen = [], set()
+    for results in web_results:
+        taken = 0
+        for r in results:
+            key = normalize_url(r['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+            urls.append(r['url'])
+            taken += 1
+            if taken >= PIPELINE_URLS_PER_QUERY:
+                break
+    emit('stage', {'stage': 'read', 'urls': urls})
+    read = checkpoints.load('read')
+    if read is None or read.get('urls') != urls or 'pages' not in read:
+        with metrics.timed('stage_seconds', span='stage', stage='read'):
+            pages = await asyncio.to_thread(_fetch_articles, urls) if urls else []
+        checkpoints.save('read', {'urls': urls, 'pages': pages})
+    else:
+        pages = [tuple(p) for p in read['pages']]
+        emit('stage_skipped', {'stage': 'read'})
+
+    # (doküman adı, içerik) çiftleri; checkpoint'ten JSON listesi olarak döner
+    kb_findings = []
+    for findings in kb_results:
+        for name, content in findings:
+            if (name, content) not in kb_findings:
+                kb_findings.append((name, content))
+
+    # 3. Tek analiz
+    emit('stage', {'stage': 'analysis'})
+    analyzer = templates.build('analyst')
+    focus_terms = run_focus.get()
+
+    def build_analysis_prompt() -> str:
+        if ANALYST_CONTEXT_TOKENS > 0:
+            # KB bulguları ve web sayfaları birlikte sıkıştırılır; tekrarlar kaynaklar arası elenir
+            sources = [(f"KB: {name}", content) for name, content in kb_findings]
+            sources += [(url, text) for url, outcome, text in pages if outcome != 'error']
+            result = compact_context(sources, focus_terms, ANALYST_CONTEXT_TOKENS, 'analyst')
+            emit('context_compacted', {'stage': 'analyst', **result.stats})
+            material = f"KAYNAK ALINTILARI (bilgi tabanı ve web, konuya göre seçilmiş):\n{result.text or '-'}"
+        else:
+            kb_text = '\n'.join(f"[{name}] {content}" for name, content in kb_findings)
+            material = (f"BİLGİ TABANI BULGULARI:\n{kb_text or '-'}\n\n"
+                        f"WEB İÇERİKLERİ:\n{_format_articles(pages) or '-'}")
+        return dedent("""
+        ANALİZ ODAKLARI:
+        {focuses}
+
+        {material}
+
+        Yukarıdaki içerikleri analiz odaklarına göre analiz et. Her odak için bulguları, kanıtları ve kaynak URL'leri madde madde yaz.
+        """).format(
+            focuses='\n'.join(f"- {f}" for f in focuses) or '-',
+            material=material,
+        )
+
+    analyzed = checkpoints.load('analysis')
+    if analyzed is None:
+        analysis_prompt = await asyncio.to_thread(build_analysis_prompt)
+        with metrics.timed('stage_seconds', span='stage', stage='analysis'):
+            analysis = await run_agent_streamed(analyzer, analysis_prompt, emit)
+        checkpoints.save('analysis', {'analysis': analysis})
+    else:
+        analysis = analyzed['analysis']
+        emit('stage_skipped', {'stage': 'analysis'})
+
+    # 4. Üç doküman aynı analizden paralel üretilir; yazma işini ajan değil kod yapar
+    emit('stage', {'stage': 'documents', 'files': output_names})
+    paths = [workspace.display_path(f) for f in output_names]
+    _, document_instructions = build_document_instructions(*paths)
+    written = {}
+
+    def make_writer(instruction: str):
+        return templates.build('writer', {'instruction': instruction})
+
+    plan_text = format_plan_text(sanitized_plan)
+    # Yazarlar yalnızca analiz metnini alır; bütçeyi aşarsa odaklara göre kısaltılır
+    writer_context = analysis
+    if 0 < WRITER_CONTEXT_TOKENS < estimate_tokens(analysis):
+        result = await asyncio.to_thread(compact_context, [('analiz', analysis)], focus_terms, WRITER_CONTEXT_TOKENS, 'writer')
+        emit('context_compacted', {'stage': 'writer', **result.stats})
+        writer_context = result.text
+
+    async def write_document(fname: str, instruction: str):
+        if checkpoints.has(f'document-{fname}') and workspace.file(fname).is_file():
+            emit('stage_skipped', {'stage': f'document-{fname}'})
+            emit_written_documents(workspace.path, [fname], written, emit)
+            return
+        content = await run_agent_streamed(
+            make_writer(instruction),
+            f"{plan_text}\nANALİZ:\n{writer_context}\n\nBu analize dayanarak dokümanı yaz.",
+            emit,
+        )
+        await asyncio.to_thread(workspace.file(fname).write_text, content, encoding='utf-8')
+        checkpoints.save(f'document-{fname}', {'filename': fname})
+        emit_written_documents(workspace.path, [fname], written, emit)
+
+    with metrics.timed('stage_seconds', span='stage', stage='documents'):
+        await asyncio.gather(*(write_document(f, i) for f, i in zip(output_names, document_instructions)))
+
+    documents = read_workspace_documents(workspace, output_names)
+
+    async def rewrite_with_writer(fix_prompt, roadmap_path):
+        content = await run_agent_streamed(make_writer(document_instructions[1]), fix_prompt, emit)
+        await asyncio.to_thread(roadmap_path.write_text, content, encoding='utf-8')
+
+    if not checkpoints.has('roadmap'):
+        with metrics.timed('stage_seconds', span='stage', stage='roadmap'):
+            validated = await validate_and_repair_roadmap(
+                sanitized_plan, workspace, documents, written, emit, rewrite_with_writer,
+                action_lines="- Yalnızca dosyanın tam markdown içeriğini döndür\n- Başka metin döndürme\n",
+            )
+        if validated:
+            checkpoints.save('roadmap', {'validated': True})
+    return analysis, documents
+
+def _submit_execution(plan: dict, mode: str | None = None):
+    sanitized_plan = sanitize_plan(plan)
+    session_id = str(uuid.uuid4())
+    user_id = f"user_{session_id}"
+    return jobs.submit(
+        'execute-plan',
+        lambda job: execute_plan(sanitized_plan, session_id, user_id, emit=job.emit, mode=mode),
+        session_id=session_id,
+    )
+
+@app.route('/execute-plan', methods=['POST'])
+def execute_plan_endpoint():
+    data = request.json
+    plan = data.get('plan')
+    if not plan:
+        return jsonify({'error': 'Plan cannot be empty'}), 400
+
+    # Geriye dönük uyumlu senkron uç: iş kuyruğa alınır ve sonucu beklenir
+    try:
+        job = _submit_execution(plan, mode=data.get('mode'))
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    try:
+        return jsonify(job.future.result())
+    except Exception as e:
+        return jsonify({'error': f'Plan uygulanırken hata oluştu: {str(e)}'}), 500
+
+@app.route('/execute-plan/stream', methods=['POST'])
+def execute_plan_stream_endpoint():
+    data = request.json
+    plan = data.get('plan')
+    if not plan:
+        return jsonify({'error': 'Plan cannot be empty'}), 400
+    try:
+        job = _submit_execution(plan, mode=data.get('mode'))
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    return sse_response(job)
+
+@app.route('/runs/<session_id>/documents', methods=['GET'])
+def get_run_documents(session_id):
+    workspace = workspaces.get(session_id)
+    if workspace is None:
+        return jsonify({'error': 'Run not found'}), 404
+    documents = [
+        {'filename': p.name, 'content': p.read_text(encoding='utf-8')}
+        for p in sorted(workspace.path.glob('*.md'))
+    ]
+    return jsonify({'session_id': session_id, 'documents': documents})
+
+@app.route('/runs/<session_id>/checkpoints', methods=['GET'])
+def get_run_checkpoints(session_id):
+    workspace = workspaces.get(session_id)
+    if workspace is None:
+        return jsonify({'error': 'Run not found'}), 404
+    checkpoints = CheckpointStore(workspace.path / "checkpoints")
+    return jsonify({
+        'session_id': session_id,
+        'completed': checkpoints.has('result'),
+        'stages': checkpoints.completed(),
+    })
+
+@app.route('/runs/<session_id>/trace', methods=['GET'])
+def get_run_trace(session_id):
+    workspace = workspaces.get(session_id)
+    trace_path = workspace.file('trace.json') if workspace is not None else None
+    if trace_path is None or not trace_path.is_file():
+        return jsonify({'error': 'Trace not found'}), 404
+    return Response(trace_path.read_text(encoding='utf-8'), mimetype='application/json')
+
+@app.route('/runs/<session_id>/resume', methods=['POST'])
+def resume_run(session_id):
+    workspace = workspaces.get(session_id)
+    if workspace is None:
+        return jsonify({'error': 'Run not found'}), 404
+    saved = CheckpointStore(workspace.path / "checkpoints").load('plan')
+    if saved is None:
+        return jsonify({'error': 'Run has no saved plan to resume from'}), 409
+    if session_id in jobs.active_session_ids():
+        return jsonify({'error': 'Run is already in progress'}), 409
+
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode') or saved.get('mode')
+    try:
+        job = jobs.submit(
+            'resume-plan',
+            lambda job: execute_plan(saved['plan'], session_id, saved['user_id'], emit=job.emit, mode=mode),
+            session_id=session_id,
+        )
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    if data.get('stream'):
+        return sse_response(job)
+    return jsonify({
+        **job.to_dict(),
+        'status_url': f'/jobs/{job.id}',
+        'result_url': f'/jobs/{job.id}/result',
+    }), 202
+
+# --- Background jobs: submit, poll, fetch result, cancel ---
+@app.route('/execute-plan/jobs', methods=['POST'])
+def submit_execute_plan_job():
+    data = request.json
+    plan = data.get('plan')
+    if not plan:
+        return jsonify({'error': 'Plan cannot be empty'}), 400
+    try:
+        job = _submit_execution(plan, mode=data.get('mode'))
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({
+        **job.to_dict(),
+        'status_url': f'/jobs/{job.id}',
+        'result_url': f'/jobs/{job.id}/result',
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status == SUCCEEDED:
+        return jsonify(job.result)
+    if job.status == FAILED:
+        return jsonify({**job.to_dict(), 'error': job.error}), 500
+    if job.status == CANCELLED:
+        return jsonify(job.to_dict()), 410
+    return jsonify(job.to_dict()), 202
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if not (jobs.cancel(job_id) or plan_jobs.cancel(job_id)):
+        return jsonify({**job.to_dict(), 'error': 'Job already finished'}), 409
+    return jsonify({**job.to_dict(), 'cancelled': True})
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    # Yeniden bağlanan istemciler kaldıkları yerden devam eder
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('after')
+    try:
+        after = int(last_event_id) if last_event_id is not None else -1
+    except ValueError:
+        after = -1
+    return sse_response(job, after=after)
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        'pages': page_cache.stats(),
+        'plans': plan_cache.stats(),
+        'search': {**search_cache.stats(), 'rate_limit': search_limiter.stats()},
+    })
+
+@app.route('/cache/plans', methods=['DELETE'])
+def clear_plan_cache():
+    return jsonify({'success': True, 'removed': plan_cache.clear()})
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    # Anlık durumlar kazıma sırasında güncellenir
+    for queue, manager in (('execute', jobs), ('plan', plan_jobs)):
+        for status, count in manager.stats()['jobs'].items():
+            metrics.set('jobs', count, queue=queue, status=status)
+    cache_stats = page_cache.stats()
+    for event in page_cache.counters:
+        metrics.set('page_cache_events_total', cache_stats[event], event=event)
+    for event, count in plan_cache.stats().items():
+        if event in plan_cache.counters:
+            metrics.set('plan_cache_events_total', count, event=event)
+    search_stats = search_cache.stats()
+    for event in search_cache.counters:
+        metrics.set('search_cache_events_total', search_stats[event], event=event)
+    metrics.set('search_rate_limit_wait_seconds_total', search_limiter.stats()['wait_seconds'])
+    metrics.set('components_ready', int(components.ready))
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# --- Admin: knowledge base indexing ---
+@app.route('/admin/kb/reindex', methods=['POST'])
+def reindex_knowledge_base():
+    data = request.get_json(silent=True) or {}
+    try:
+        summary = components.get('kb_indexer').sync(full=bool(data.get('full')))
+    except Exception as e:
+        return jsonify({'error': f'Knowledge base reindex failed: {str(e)}'}), 500
+    return jsonify({'success': True, 'summary': summary})
+
+@app.route('/admin/kb/status', methods=['GET'])
+def knowledge_base_status():
+    try:
+        return jsonify(components.get('kb_indexer').status())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 503
+
+@app.route('/admin/mcp/status', methods=['GET'])
+def mcp_pool_status():
+    if FS_TOOLS_BACKEND == 'local':
+        return jsonify({'backend': 'local'})
+    try:
+        return jsonify({'backend': 'mcp', **components.get('mcp_pool').status()})
+    except Exception as e:
+        return jsonify({'backend': 'mcp', 'error': str(e)}), 503
+
+@app.route('/admin/templates', methods=['GET'])
+def templates_status():
+    try:
+        templates = components.get('agent_templates')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({
+        'templates': {
+            key: {'params': sorted(templates.get(key).params), 'built': templates.built.get(key, 0)}
+            for key in templates.keys()
+        },
+    })
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs_stats():
+    return jsonify({'execute': jobs.stats(), 'plan': plan_jobs.stats()})
+
+
+# --- Health & readiness ---
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({'status': 'ok', 'uptime_seconds': round(time.time() - components.created_at, 3)})
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    report = components.report()
+    report['startup_mode'] = STARTUP_MODE
+    report['module_import_seconds'] = MODULE_IMPORT_SECONDS
+    # lazy modda bileşenler ilk istekte kurulur; sunucu trafiği kabul etmeye hazırdır
+    ready = report['ready'] or STARTUP_MODE == 'lazy'
+    report['ready'] = ready
+    return jsonify(report), (200 if ready else 503)
+
 
 # Legacy endpoint for backward compatibility (can be removed later)
 @app.route('/generate-queries', methods=['POST'])
@@ -430,6 +1578,26 @@ def analyze_and_propose_endpoint():
     return jsonify({'error': 'This endpoint is deprecated. Use /execute-plan instead.'}), 410
 
 
+def _print_startup_report(ok: bool):
+    print(f"Startup report (mode={STARTUP_MODE}, module import {MODULE_IMPORT_SECONDS:.3f}s, ready={ok}):")
+    print(components.format_report())
+
+MODULE_IMPORT_SECONDS = round(time.perf_counter() - _MODULE_STARTED, 4)
+# `app.run(debug=True)` altında Werkzeug yeniden yükleyicisinin üst süreci istek sunmaz, yalnızca
+# WERKZEUG_RUN_MAIN=true ile alt süreci başlatır. Isınma (KB indeksleyici, MCP oturumları) yalnızca
+# sunan süreçte yapılır; aksi halde iki süreç aynı LanceDB tablosunu ve manifesti eşitler.
+_RELOADER_PARENT = __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+if STARTUP_MODE == 'eager' and not _RELOADER_PARENT:
+    if not components.warm_up():
+        _print_startup_report(False)
+        exit(1)
+    _print_startup_report(True)
+elif STARTUP_MODE != 'lazy' and not _RELOADER_PARENT:
+    components.warm_up_in_background(on_done=_print_startup_report)
+if not _RELOADER_PARENT:
+    # Eski çalıştırma dizinleri istek yolunda değil, arka plan thread'inde temizlenir
+    workspaces.start()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
 
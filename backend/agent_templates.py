@@ -0,0 +1,78 @@
+# agent_templates.py
+# Önceden tanımlı ajan/takım şablonları. Talimat listeleri kayıt anında bir kez hazırlanır;
+# yalnızca yer tutucu içeren satırlar ({path1}, {today} vb.) çalıştırma başına biçimlendirilir.
+# agno Agent/Team nesneleri çalıştırma durumu (run_response, oturum, araç durumu) taşıdığından
+# her çalıştırmaya yeni örnek verilir; modeller ise tek bir paylaşılan httpx bağlantı havuzunu
+# kullanır, böylece istekler arasında TLS bağlantıları korunur.
+import string
+
+_FORMATTER = string.Formatter()
+
+
+def _placeholders(text: str) -> set[str]:
+    return {field for _, field, _, _ in _FORMATTER.parse(text) if field}
+
+
+class AgentTemplate:
+    def __init__(self, key: str, instructions, name: str | None = None, model_id: str = "gpt-4o-mini",
+                 team: bool = False, **options):
+        """`instructions` öğeleri metin ya da metin listesi olabilir; listeler çalıştırmada açılır."""
+        self.key = key
+        self.name = name
+        self.model_id = model_id
+        self.team = team
+        self.options = options
+        self._instructions = tuple(instructions)
+        self.params = set()
+        for item in self._instructions:
+            for text in (item if isinstance(item, (list, tuple)) else (item,)):
+                self.params |= _placeholders(text)
+
+    def render_instructions(self, params: dict) -> list[str]:
+        missing = self.params - params.keys()
+        if missing:
+            raise KeyError(f"Template '{self.key}' requires parameters: {', '.join(sorted(missing))}")
+        rendered = []
+        for item in self._instructions:
+            for text in (item if isinstance(item, (list, tuple)) else (item,)):
+                rendered.append(text.format(**params) if _placeholders(text) else text)
+        return rendered
+
+
+class TemplateRegistry:
+    def __init__(self, agent_cls, team_cls, model_factory, debug_mode: bool = False):
+        """`model_factory(model_id)` paylaşılan istemciye bağlı yeni bir model nesnesi döndürür."""
+        self.agent_cls = agent_cls
+        self.team_cls = team_cls
+        self.model_factory = model_factory
+        self.debug_mode = debug_mode
+        self._templates: dict[str, AgentTemplate] = {}
+        self.built: dict[str, int] = {}
+
+    def register(self, template: AgentTemplate):
+        self._templates[template.key] = template
+
+    def get(self, key: str) -> AgentTemplate:
+        return self._templates[key]
+
+    def build(self, key: str, params: dict | None = None, **overrides):
+        """Şablondan çalıştırmaya özel bir Agent (ya da Team) üretir.
+
+        `params` talimat yer tutucularını doldurur; diğer anahtar kelimeler (tools, members,
+        session_id, user_id, knowledge...) şablon seçeneklerini ezer.
+        """
+        template = self._templates[key]
+        kwargs = {
+            'model': self.model_factory(template.model_id),
+            'instructions': template.render_instructions(params or {}),
+            'debug_mode': self.debug_mode,
+            **template.options,
+            **overrides,
+        }
+        if template.name is not None:
+            kwargs.setdefault('name', template.name)
+        self.built[key] = self.built.get(key, 0) + 1
+        return (self.team_cls if template.team else self.agent_cls)(**kwargs)
+
+    def keys(self) -> list[str]:
+        return list(self._templates)
@@ -0,0 +1,249 @@
+# bench_e2e.py
+# Çevrimdışı uçtan uca benchmark: /generate-plan ve /execute-plan uçlarını Flask uygulaması
+# üzerinden, yerel sahte servislere karşı çalıştırır (fakes.py): OpenAI uyumlu sohbet sunucusu
+# (OPENAI_BASE_URL ile), Google araması yerine fixture arama aracı ve kayıtlı HTML sunan site.
+# p50/p95 gecikme, N eşzamanlı çalıştırmada verim, bellek tepe değeri ve çalıştırma başına
+# LLM/araç çağrı sayılarını raporlar; sonuçları bench/results/ altına kaydedip öncekiyle karşılaştırır.
+#
+# Kullanım (backend/ dizininden):
+#   python bench/bench_e2e.py --runs 8 --concurrency 4 --mode both
+#   python bench/bench_e2e.py --runs 8 --concurrency 4 --compare latest --fail-on-regression
+import argparse
+import datetime
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import FakeOpenAIServer, FixtureSiteServer, make_stub_search_tools  # noqa: E402
+
+RESULTS_DIR = Path(__file__).parent / "results"
+USER_MESSAGE = "Dijital bankacılık uygulamamız için kredi kartı kampanyalarını rakiplerle karşılaştırıp bir ürün stratejisi hazırla."
+
+# Karşılaştırmada izlenen metrikler: hepsi "düşük olan iyi", throughput hariç
+TRACKED = {
+    'plan_p50_ms': 'lower', 'plan_p95_ms': 'lower',
+    'execute_p50_ms': 'lower', 'execute_p95_ms': 'lower',
+    'total_p95_ms': 'lower', 'runs_per_minute': 'higher',
+    'llm_requests_per_run': 'lower', 'tool_calls_per_run': 'lower',
+    'peak_rss_mb': 'lower',
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """En yakın sıra yöntemiyle yüzdelik."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta KB, macOS'ta bayt döner
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def configure_environment(args, openai: FakeOpenAIServer, output_dir: Path):
+    """agent modülü import edilmeden önce çağrılmalıdır; yapılandırma import anında okunur."""
+    os.environ.update({
+        'OPENAI_BASE_URL': openai.base_url,
+        'OPENAI_API_KEY': 'bench',
+        'AGENT_OUTPUT_DIR': str(output_dir),
+        'AGENT_DEBUG': 'false',
+        'STARTUP_MODE': 'lazy',
+        'FS_TOOLS_BACKEND': 'local',
+        'KB_WATCH_INTERVAL': '0',
+        'MAX_CONCURRENT_RUNS': str(args.concurrency),
+        'MAX_QUEUED_RUNS': str(max(16, args.runs)),
+        'PAGE_CACHE_TTL': '0' if args.cold_cache else str(6 * 3600),
+        # Her çalıştırma aynı mesajı gönderir; plan önbelleği açıksa yalnızca ilk plan üretilir
+        'PLAN_CACHE_ENABLED': 'true' if args.plan_cache else 'false',
+    })
+
+
+def run_once(app, mode: str) -> dict:
+    client = app.test_client()
+    record = {'mode': mode, 'ok': False}
+    started = time.perf_counter()
+    response = client.post('/generate-plan', json={'message': USER_MESSAGE})
+    record['plan_ms'] = (time.perf_counter() - started) * 1000
+    plan = (response.get_json() or {}).get('plan') if response.status_code == 200 else None
+    if not plan:
+        record['error'] = f"generate-plan {response.status_code}"
+        return record
+
+    started = time.perf_counter()
+    response = client.post('/execute-plan', json={'plan': plan, 'mode': mode})
+    record['execute_ms'] = (time.perf_counter() - started) * 1000
+    body = response.get_json() or {}
+    if response.status_code != 200 or not body.get('success'):
+        record['error'] = f"execute-plan {response.status_code}: {body.get('error')}"
+        return record
+
+    record['ok'] = True
+    record['documents'] = len(body.get('documents') or [])
+    trace = client.get(f"/runs/{body['session_id']}/trace")
+    record['trace_counts'] = (trace.get_json() or {}).get('counts', {}) if trace.status_code == 200 else {}
+    return record
+
+
+def bench_mode(app, args, mode: str, openai: FakeOpenAIServer, site: FixtureSiteServer, search_cls) -> dict:
+    openai.reset_counts()
+    site.requests = site.not_modified = 0
+    search_cls.calls = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as ex:
+        records = list(ex.map(lambda _: run_once(app, mode), range(args.runs)))
+    wall = time.perf_counter() - started
+
+    ok = [r for r in records if r['ok']]
+    llm_calls = openai.reset_counts()
+    llm_calls.pop('embeddings', None)
+    tool_calls = [r['trace_counts'].get('tool_calls', 0) for r in ok]
+    runs = max(1, len(records))
+    return {
+        'mode': mode,
+        'runs': len(records),
+        'errors': [r['error'] for r in records if not r['ok']],
+        'wall_seconds': round(wall, 3),
+        'runs_per_minute': round(len(ok) / wall * 60, 2) if wall else 0.0,
+        'plan_p50_ms': round(percentile([r['plan_ms'] for r in records], 50), 1),
+        'plan_p95_ms': round(percentile([r['plan_ms'] for r in records], 95), 1),
+        'execute_p50_ms': round(percentile([r['execute_ms'] for r in ok], 50), 1),
+        'execute_p95_ms': round(percentile([r['execute_ms'] for r in ok], 95), 1),
+        'total_p95_ms': round(percentile([r['plan_ms'] + r['execute_ms'] for r in ok], 95), 1),
+        'llm_requests_per_run': round(sum(llm_calls.values()) / runs, 2),
+        'llm_requests_by_agent': {k: round(v / runs, 2) for k, v in sorted(llm_calls.items())},
+        'tool_calls_per_run': round(sum(tool_calls) / max(1, len(ok)), 2),
+        'search_calls_per_run': round(search_cls.calls / runs, 2),
+        'page_requests_per_run': round(site.requests / runs, 2),
+        'tokens_per_run': round(sum(r['trace_counts'].get('input_tokens', 0) + r['trace_counts'].get('output_tokens', 0)
+                                    for r in ok) / max(1, len(ok))),
+        'roadmap_repairs': sum(r['trace_counts'].get('roadmap_repairs', 0) for r in ok),
+        'roadmap_regenerations': sum(r['trace_counts'].get('roadmap_regenerations', 0) for r in ok),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def compare(current: dict, previous: dict, threshold: float) -> list[str]:
+    """Eşiği aşan kötüleşmeleri döndürür ve karşılaştırma tablosunu basar."""
+    regressions = []
+    before = {m['mode']: m for m in previous.get('modes', [])}
+    print(f"\nComparison with {previous.get('saved_as')} (rev {previous.get('revision')}):")
+    print(f"{'mode':<12}{'metric':<24}{'before':>12}{'after':>12}{'delta':>9}")
+    for result in current['modes']:
+        old = before.get(result['mode'])
+        if old is None:
+            continue
+        for metric, better in TRACKED.items():
+            a, b = old.get(metric), result.get(metric)
+            if not a or b is None:
+                continue
+            delta = (b - a) / a
+            worse = delta > threshold if better == 'lower' else delta < -threshold
+            flag = '  REGRESSION' if worse else ''
+            print(f"{result['mode']:<12}{metric:<24}{a:>12}{b:>12}{delta:>+8.1%}{flag}")
+            if worse:
+                regressions.append(f"{result['mode']}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline end-to-end benchmark for /generate-plan and /execute-plan')
+    parser.add_argument('--runs', type=int, default=4, help='runs per mode')
+    parser.add_argument('--concurrency', type=int, default=2)
+    parser.add_argument('--mode', choices=('coordinate', 'pipeline', 'both'), default='both')
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='seconds before the first token')
+    parser.add_argument('--llm-tps', type=float, default=400.0, help='fake model tokens per second')
+    parser.add_argument('--search-latency', type=float, default=0.1)
+    parser.add_argument('--page-latency', type=float, default=0.05)
+    parser.add_argument('--cold-cache', action='store_true', help='PAGE_CACHE_TTL=0: every fetch revalidates')
+    parser.add_argument('--plan-cache', action='store_true', help='keep the /generate-plan cache enabled')
+    parser.add_argument('--label', default='')
+    parser.add_argument('--no-save', action='store_true')
+    parser.add_argument('--compare', help="previous result file, or 'latest'")
+    parser.add_argument('--threshold', type=float, default=0.15, help='relative change counted as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    openai = FakeOpenAIServer(latency=args.llm_latency, tokens_per_second=args.llm_tps).start()
+    site = FixtureSiteServer(latency=args.page_latency).start()
+    output_dir = Path(tempfile.mkdtemp(prefix='agent-bench-'))
+    configure_environment(args, openai, output_dir)
+
+    started = time.perf_counter()
+    import agent  # noqa: E402  (ortam değişkenleri ayarlandıktan sonra)
+    import_seconds = time.perf_counter() - started
+    search_cls = make_stub_search_tools(site, latency=args.search_latency)
+    agent.components.register('search_tools', lambda: search_cls)
+    started = time.perf_counter()
+    if not agent.components.warm_up():
+        print(agent.components.format_report())
+        sys.exit(1)
+    warmup_seconds = time.perf_counter() - started
+
+    modes = ('coordinate', 'pipeline') if args.mode == 'both' else (args.mode,)
+    result = {
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'label': args.label,
+        'config': {k: v for k, v in vars(args).items() if k not in ('compare', 'no_save', 'fail_on_regression')},
+        'import_seconds': round(import_seconds, 3),
+        'warmup_seconds': round(warmup_seconds, 3),
+        'modes': [bench_mode(agent.app, args, mode, openai, site, search_cls) for mode in modes],
+    }
+
+    print(f"Output dir: {output_dir}  import {import_seconds:.2f}s  warm-up {warmup_seconds:.2f}s")
+    print(f"{'mode':<12}{'runs':>5}{'err':>5}{'plan p50':>10}{'p95':>8}{'exec p50':>10}{'p95':>8}"
+          f"{'runs/min':>10}{'llm/run':>9}{'tools/run':>10}{'rss MB':>8}")
+    for m in result['modes']:
+        print(f"{m['mode']:<12}{m['runs']:>5}{len(m['errors']):>5}{m['plan_p50_ms']:>10.0f}{m['plan_p95_ms']:>8.0f}"
+              f"{m['execute_p50_ms']:>10.0f}{m['execute_p95_ms']:>8.0f}{m['runs_per_minute']:>10.1f}"
+              f"{m['llm_requests_per_run']:>9.1f}{m['tool_calls_per_run']:>10.1f}{m['peak_rss_mb']:>8.0f}")
+        for error in m['errors'][:3]:
+            print(f"  error: {error}")
+
+    previous = None
+    if args.compare:
+        candidates = sorted(RESULTS_DIR.glob('e2e-*.json')) if args.compare == 'latest' else [Path(args.compare)]
+        if candidates and candidates[-1].is_file():
+            previous = json.loads(candidates[-1].read_text(encoding='utf-8'))
+            previous.setdefault('saved_as', candidates[-1].name)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = RESULTS_DIR / f"e2e-{stamp}{'-' + args.label if args.label else ''}.json"
+        path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"Saved {path.relative_to(BACKEND_DIR)}")
+
+    regressions = compare(result, previous, args.threshold) if previous else []
+    openai.stop()
+    site.stop()
+    if regressions and args.fail_on_regression:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# bench_extract.py
+# read_articles metin çıkarma mikro-benchmark'ı: eski yol (tam gövde + BeautifulSoup
+# html.parser ağacı + karakter karakter isprintable filtresi) ile web_reader'daki artımlı
+# çıkarıcıyı kayıtlı HTML fixture'ları üzerinde karşılaştırır.
+#
+# Kullanım (backend/ dizininden):  python bench/bench_extract.py [--repeat 20] [--max-chars 3000]
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from web_reader import CHUNK_SIZE, extract_text, _lxml_etree  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def legacy_extract(raw: bytes, max_chars: int) -> str:
+    """agent.py'deki eski fetch() gövdesinin ağ dışındaki kısmı."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(raw.decode('utf-8', errors='replace'), 'html.parser')
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        element.decompose()
+    text = soup.get_text(separator=' ', strip=True)
+    text = re.sub(r'\s+', ' ', text)
+    text = ''.join(char for char in text if char.isprintable() or char in '\n\t')
+    return text[:max_chars]
+
+
+def streaming_extract(raw: bytes, max_chars: int) -> str:
+    chunks = (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    return extract_text(chunks, max_chars)[:max_chars]
+
+
+def time_it(fn, raw: bytes, max_chars: int, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(raw, max_chars)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='read_articles extraction micro-benchmark')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-chars', type=int, default=3000)
+    args = parser.parse_args()
+
+    backend = 'lxml' if _lxml_etree is not None else 'html.parser (stdlib)'
+    print(f"Streaming extractor backend: {backend}")
+    print(f"{'fixture':<28}{'size KB':>9}{'legacy ms':>12}{'stream ms':>12}{'speedup':>9}")
+    for path in sorted(FIXTURES_DIR.glob('*.html')):
+        raw = path.read_bytes()
+        legacy = statistics.median(time_it(legacy_extract, raw, args.max_chars, args.repeat))
+        stream = statistics.median(time_it(streaming_extract, raw, args.max_chars, args.repeat))
+        print(f"{path.name:<28}{len(raw) / 1024:>9.1f}{legacy:>12.2f}{stream:>12.2f}{legacy / stream:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,411 @@
+# fakes.py
+# Uçtan uca benchmark için yerel sahte servisler: OpenAI uyumlu sohbet/embedding sunucusu,
+# kayıtlı HTML fixture'larını sunan site sunucusu ve Google araması yerine geçen arama aracı.
+# Sahte model, sistem talimatından hangi ajanla konuştuğunu çıkarır ve o ajanın beklediği
+# biçimde (JSON plan, araç çağrıları, roadmap tablosu vb.) deterministik yanıt üretir.
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+URL_RE = re.compile(r'https?://[^\s\'"<>)\]]+')
+
+PLAN = {
+    'research_queries': [
+        'dijital bankacılık mobil uygulama trendleri 2025',
+        'banka kampanya karşılaştırması kredi kartı',
+        'fintech rakip analizi müşteri edinme',
+    ],
+    'analysis_focus': [
+        'Mobil kanal müşteri beklentileri',
+        'Rakip kampanya ve fiyat konumlandırması',
+        'Dijital edinim maliyeti ve dönüşüm',
+    ],
+}
+
+ROADMAP_DOC = """# Ürün Roadmap
+
+| Sprint/Release | Epic/Feature | User Story/Kapsam | Aşama (Discovery, Design, Build, Test, Launch) | Sorumlu (kişi/ekip) | Başlangıç (YYYY-MM-DD) | Bitiş (YYYY-MM-DD) | Öncelik (Yüksek/Orta/Düşük) | Bağımlılıklar | KPI/Metrik (ör. aktivasyon oranı, NPS, hata oranı) |
+|---|---|---|---|---|---|---|---|---|---|
+| R1 | Hızlı onboarding | Müşteri 5 dakikada hesap açar | Discovery | Ürün Yönetimi | 2025-01-06 | 2025-01-31 | Yüksek | Kimlik doğrulama API | Aktivasyon oranı |
+| R1 | Kampanya vitrini | Kişiye özel kampanya listesi | Design | Tasarım | 2025-02-03 | 2025-02-28 | Yüksek | Kampanya servisi | Tıklama oranı |
+| R2 | Kart başvurusu | Uygulama içi kredi kartı başvurusu | Build | Mobil Squad | 2025-03-03 | 2025-04-11 | Yüksek | Skorlama servisi | Başvuru dönüşümü |
+| R2 | Bildirim merkezi | Harcama ve kampanya bildirimleri | Build | Backend Squad | 2025-03-17 | 2025-04-25 | Orta | Push altyapısı | NPS |
+| R3 | Performans iyileştirme | Açılış süresi 2 saniyenin altında | Test | QA | 2025-05-05 | 2025-05-30 | Orta | Gözlemlenebilirlik | Hata oranı |
+| R3 | Genel erişim | Tüm müşterilere açılış | Launch | Ürün Yönetimi | 2025-06-02 | 2025-06-13 | Düşük | Mağaza onayı | Aktif kullanıcı |
+"""
+
+PAIN_POINTS_DOC = """# Acı Noktaları
+
+Müşteriler mobil kanalda hızlı ve şeffaf bir deneyim bekliyor.
+
+1. **Uzun onboarding**: Hesap açılışı 15 dakikayı aşıyor; terk oranı yüksek.
+2. **Dağınık kampanyalar**: Kampanyalar kişiselleştirilmemiş; katılım düşük.
+3. **Yavaş uygulama**: Açılış süresi rakiplerin iki katı.
+
+| KPI | mevcut | hedef |
+|---|---|---|
+| Aktivasyon oranı | %32 | %50 |
+| NPS | 18 | 35 |
+"""
+
+STRATEGY_DOC = """# İş Stratejisi
+
+## Yönetsel Özet
+Mobil kanalda hızlı onboarding ve kişisel kampanyalarla edinim maliyeti düşürülür.
+
+## Analiz Bulguları
+Rakipler kampanya kişiselleştirmesinde öne geçmiş durumda.
+
+## Değer Önerisi ve Ürün Stratejisi
+Beş dakikada hesap, uygulama içi kart başvurusu.
+
+## Riskler ve Önlemler
+Regülasyon değişiklikleri için erken uyum kontrolü.
+
+## Sonraki Adım
+Onboarding keşif çalışmasının başlatılması.
+"""
+
+ANALYSIS_TEXT = """## Analiz
+- **Mobil kanal müşteri beklentileri**: Kullanıcılar hızlı onboarding ve anlık bildirim bekliyor.
+- **Rakip kampanya ve fiyat konumlandırması**: Rakipler puan ve taksit kampanyalarını öne çıkarıyor.
+- **Dijital edinim maliyeti ve dönüşüm**: Uygulama içi başvuru dönüşümü şubeye göre daha yüksek.
+"""
+
+
+def _text(content) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ' '.join(p.get('text', '') for p in content if isinstance(p, dict))
+    return ''
+
+
+def _document_for(name: str) -> str:
+    if 'roadmap' in name:
+        return ROADMAP_DOC
+    if 'pain' in name:
+        return PAIN_POINTS_DOC
+    return STRATEGY_DOC
+
+
+class FakeOpenAIServer:
+    """OpenAI uyumlu /v1/chat/completions (akışlı/akışsız) ve /v1/embeddings sunucusu."""
+
+    def __init__(self, latency: float = 0.2, tokens_per_second: float = 400.0, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                if self.path.endswith('/embeddings'):
+                    server._count('embeddings')
+                    self._json(server.embeddings(body))
+                elif self.path.endswith('/chat/completions'):
+                    role, content, tool_calls = server.respond(body)
+                    server._count(role)
+                    time.sleep(server.latency)
+                    usage = server.usage(body, content, tool_calls)
+                    if body.get('stream'):
+                        self._stream(body, content, tool_calls, usage)
+                    else:
+                        self._json(server.completion(body, content, tool_calls, usage))
+                else:
+                    self.send_error(404)
+
+            def _json(self, payload: dict):
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body: dict, content: str, tool_calls: list, usage: dict):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                for chunk in server.chunks(body, content, tool_calls, usage):
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}/v1"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, role: str):
+        with self._lock:
+            self.counts[role] = self.counts.get(role, 0) + 1
+
+    def reset_counts(self) -> dict:
+        with self._lock:
+            counts, self.counts = self.counts, {}
+        return counts
+
+    # --- Yanıt politikası ---
+    def respond(self, body: dict) -> tuple[str, str, list]:
+        """(ajan rolü, metin, araç çağrıları) döndürür."""
+        messages = body.get('messages') or []
+        system = ' '.join(_text(m.get('content')) for m in messages if m.get('role') in ('system', 'developer'))
+        last_user = max((i for i, m in enumerate(messages) if m.get('role') == 'user'), default=-1)
+        user = _text(messages[last_user].get('content')) if last_user >= 0 else ''
+        rounds = sum(1 for m in messages[last_user + 1:] if m.get('role') == 'assistant' and m.get('tool_calls'))
+        tool_results = [_text(m.get('content')) for m in messages[last_user + 1:] if m.get('role') == 'tool']
+        tools = {t['function']['name']: t['function'] for t in body.get('tools') or [] if t.get('type') == 'function'}
+
+        if 'Stratejik Planlama' in system:
+            return 'planner', json.dumps(PLAN, ensure_ascii=False), []
+
+        if 'Proje Koordinatörü' in system:
+            delegate = next((n for n in tools if 'member' in n), None)
+            members = re.findall(r'ID:\s*([^\s]+)', system) or ['araştırmacı', 'i̇çerik-okuyucu', 'analist', 'i̇ş-planı-uzmanı']
+            if delegate and rounds < len(members):
+                task = user if not tool_results else f"{user}\n\nÖnceki çıktı:\n{tool_results[-1]}"
+                return 'coordinator', '', [(delegate, self._fill_args(tools[delegate], members[rounds], task))]
+            return 'coordinator', '\n\n'.join(tool_results[-1:]) or 'Tamamlandı.', []
+
+        if 'Araştırmacısın' in system:
+            if rounds == 0 and 'google_search' in tools:
+                queries = [q for q in PLAN['research_queries'] if q in user] or PLAN['research_queries']
+                calls = [('google_search', {'query': q, 'max_results': 5}) for q in queries]
+                kb_tool = next((n for n in tools if 'knowledge' in n), None)
+                if kb_tool:
+                    calls.append((kb_tool, self._fill_args(tools[kb_tool], '', queries[0])))
+                return 'searcher', '', calls
+            urls = URL_RE.findall(' '.join(tool_results))
+            return 'searcher', '\n'.join(f"- {u}" for u in dict.fromkeys(urls)) or '- sonuç yok', []
+
+        if 'İçerik Okuyucusun' in system:
+            if rounds == 0 and 'read_articles' in tools:
+                urls = list(dict.fromkeys(URL_RE.findall(user)))[:6]
+                return 'reader', '', [('read_articles', {'urls': urls})]
+            return 'reader', f"- {len(tool_results)} kaynak okundu, bulgular özetlendi.", []
+
+        if 'Rol: İş Stratejisti' in system:
+            if 'write_file' in tools:
+                paths = re.findall(r"kaydet: '([^']+)', '([^']+)', '([^']+)'", system)
+                if 'ROADMAP' in user and "dosyası ürün ROADMAP" in user:
+                    target = re.search(r"'([^']+)' dosyası", user)
+                    paths = [(target.group(1),)] if target else []
+                if rounds == 0 and paths:
+                    return 'proposer', '', [
+                        ('write_file', {'path': p, 'content': _document_for(Path(p).name)}) for p in paths[0]
+                    ]
+                return 'proposer', 'Dosyalar kaydedildi.', []
+            # Pipeline yazarı: tek doküman talimatı ya da roadmap onarım istemi
+            if '(roadmap.md)' in system or 'ROADMAP' in user:
+                return 'writer', ROADMAP_DOC, []
+            if '(pain_points.md)' in system:
+                return 'writer', PAIN_POINTS_DOC, []
+            return 'writer', STRATEGY_DOC, []
+
+        if 'İş Analist' in system:
+            return 'analyst', ANALYSIS_TEXT, []
+
+        return 'other', 'Tamam.', []
+
+    @staticmethod
+    def _fill_args(function: dict, member_id: str, task: str) -> dict:
+        params = (function.get('parameters') or {}).get('properties') or {}
+        args = {}
+        for name, spec in params.items():
+            if 'member' in name:
+                args[name] = member_id
+            elif spec.get('type') in ('string', None):
+                args[name] = task[:4000]
+        return args or {'query': task[:200]}
+
+    # --- OpenAI biçimleri ---
+    @staticmethod
+    def usage(body: dict, content: str, tool_calls: list) -> dict:
+        prompt = max(1, len(json.dumps(body.get('messages') or [], ensure_ascii=False)) // 4)
+        completion = max(1, (len(content) + len(json.dumps([a for _, a in tool_calls], ensure_ascii=False))) // 4)
+        return {'prompt_tokens': prompt, 'completion_tokens': completion, 'total_tokens': prompt + completion}
+
+    @staticmethod
+    def _tool_call_dicts(tool_calls: list) -> list[dict]:
+        return [
+            {'id': f"call_{uuid.uuid4().hex[:12]}", 'type': 'function',
+             'function': {'name': name, 'arguments': json.dumps(args, ensure_ascii=False)}}
+            for name, args in tool_calls
+        ]
+
+    def completion(self, body: dict, content: str, tool_calls: list, usage: dict) -> dict:
+        if content:
+            time.sleep(usage['completion_tokens'] / self.tokens_per_second)
+        message = {'role': 'assistant', 'content': content or None}
+        if tool_calls:
+            message['tool_calls'] = self._tool_call_dicts(tool_calls)
+        return {
+            'id': f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{'index': 0, 'message': message, 'finish_reason': 'tool_calls' if tool_calls else 'stop'}],
+            'usage': usage,
+        }
+
+    def chunks(self, body: dict, content: str, tool_calls: list, usage: dict):
+        base = {
+            'id': f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+        }
+        yield {**base, 'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': ''}, 'finish_reason': None}]}
+        words = re.findall(r'\S+\s*|\s+', content)
+        for i in range(0, len(words), 8):
+            piece = ''.join(words[i:i + 8])
+            time.sleep(max(1, len(piece) // 4) / self.tokens_per_second)
+            yield {**base, 'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]}
+        for index, call in enumerate(self._tool_call_dicts(tool_calls)):
+            yield {**base, 'choices': [{'index': 0, 'delta': {'tool_calls': [{'index': index, **call}]}, 'finish_reason': None}]}
+        yield {**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'tool_calls' if tool_calls else 'stop'}]}
+        if (body.get('stream_options') or {}).get('include_usage'):
+            yield {**base, 'choices': [], 'usage': usage}
+
+    @staticmethod
+    def embeddings(body: dict) -> dict:
+        inputs = body.get('input')
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        dimensions = int(body.get('dimensions') or 1536)
+        data = []
+        for index, item in enumerate(inputs):
+            seed = int.from_bytes(hashlib.sha256(str(item).encode('utf-8')).digest()[:8], 'big')
+            rng = random.Random(seed)
+            data.append({'object': 'embedding', 'index': index, 'embedding': [rng.uniform(-1, 1) for _ in range(dimensions)]})
+        tokens = sum(len(str(i)) // 4 for i in inputs)
+        return {'object': 'list', 'data': data, 'model': body.get('model', 'fake'),
+                'usage': {'prompt_tokens': tokens, 'total_tokens': tokens}}
+
+
+class FixtureSiteServer:
+    """bench/fixtures altındaki HTML dosyalarını gecikmeli, ETag/Last-Modified destekli sunar."""
+
+    def __init__(self, latency: float = 0.05, directory: Path = FIXTURES_DIR, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.pages = {p.name: p.read_bytes() for p in sorted(Path(directory).glob('*.html'))}
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        started = formatdate(time.time(), usegmt=True)
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+                name = self.path.split('?', 1)[0].lstrip('/')
+                raw = server.pages.get(name)
+                if raw is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hashlib.md5(raw).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(raw)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', started)
+                self.end_headers()
+                self.wfile.write(raw)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-site', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def urls_for(self, query: str, count: int = 5) -> list[str]:
+        """Sorgu başına deterministik, sorgular arasında kısmen örtüşen URL listesi."""
+        names = list(self.pages)
+        offset = int(hashlib.sha256(query.encode('utf-8')).hexdigest(), 16) % len(names)
+        urls = []
+        for i in range(count):
+            name = names[(offset + i) % len(names)]
+            # Aynı sayfa farklı sorgularda izleme parametresiyle döner; tekilleştirme bunu yakalamalı
+            urls.append(f"{self.base_url}/{name}?p={i // len(names)}&utm_source={quote(query[:16])}")
+        return urls
+
+
+def make_stub_search_tools(site: FixtureSiteServer, latency: float = 0.1):
+    """GoogleSearchTools ile aynı arayüze sahip, fixture sitesine işaret eden arama aracı sınıfı."""
+    from agno.tools import Toolkit
+
+    class StubSearchTools(Toolkit):
+        calls = 0
+        _lock = threading.Lock()
+
+        def __init__(self, **kwargs):
+            super().__init__(name="googlesearch", **kwargs)
+            self.register(self.google_search)
+
+        def google_search(self, query: str, max_results: int = 5, language: str = "en") -> str:
+            """Use this function to search Google for a specified query.
+
+            Args:
+                query (str): The query to search for.
+                max_results (int, optional): The maximum number of results to return. Default is 5.
+                language (str, optional): The language of the search results. Default is "en".
+
+            Returns:
+                str: A JSON formatted string containing the search results.
+            """
+            with StubSearchTools._lock:
+                StubSearchTools.calls += 1
+            time.sleep(latency)
+            return json.dumps([
+                {'title': f"{query} #{i + 1}", 'url': url, 'description': f"{query} hakkında sonuç {i + 1}"}
+                for i, url in enumerate(site.urls_for(query, max_results))
+            ], ensure_ascii=False)
+
+    return StubSearchTools
@@ -0,0 +1,51 @@
+# checkpoints.py
+# Çalıştırma aşamalarının çıktılarını oturumun çalıştırma dizininde JSON olarak saklar;
+# yarıda kalan bir çalıştırma son tamamlanan aşamadan devam ettirilebilir.
+import json
+import re
+import time
+from pathlib import Path
+
+_STAGE_RE = re.compile(r'[^A-Za-z0-9_.\-]')
+
+
+class CheckpointStore:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, stage: str) -> Path:
+        return self.directory / f"{_STAGE_RE.sub('_', stage)}.json"
+
+    def save(self, stage: str, data):
+        """Aşama çıktısını atomik olarak yazar (önce geçici dosya, sonra yeniden adlandırma)."""
+        path = self._path(stage)
+        tmp = path.with_suffix('.tmp')
+        payload = {'stage': stage, 'saved_at': time.time(), 'data': data}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, default=str), encoding='utf-8')
+        tmp.replace(path)
+
+    def load(self, stage: str):
+        try:
+            return json.loads(self._path(stage).read_text(encoding='utf-8'))['data']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def has(self, stage: str) -> bool:
+        return self._path(stage).is_file()
+
+    def discard(self, stage: str):
+        try:
+            self._path(stage).unlink()
+        except OSError:
+            pass
+
+    def completed(self) -> list[dict]:
+        stages = []
+        for path in sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime):
+            try:
+                payload = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            stages.append({'stage': payload.get('stage'), 'saved_at': payload.get('saved_at')})
+        return stages
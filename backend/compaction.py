@@ -0,0 +1,202 @@
+# compaction.py
+# Ajanlar arası bağlam sıkıştırma: okunan sayfa metinleri parçalara bölünür, kaynaklar arası
+# neredeyse aynı parçalar (menü, çerez uyarısı, kampanya şablonları) MinHash ile elenir,
+# kalanlar analiz odaklarına göre BM25 ile sıralanır ve verilen token bütçesine sığacak kadarı
+# kaynak sırasıyla paketlenir.
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+|\n{2,}')
+# Türkçe eklemeli bir dil; kelimenin ilk 5 harfi kaba ama etkili bir gövde yerine geçer
+STEM_CHARS = 5
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def estimate_tokens(text: str) -> int:
+    """Yaklaşık token sayısı (OpenAI tokenizer'ında Türkçe/İngilizce metin için ~4 karakter/token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def tokenize(text: str) -> list[str]:
+    return [w[:STEM_CHARS] for w in _WORD_RE.findall(text.casefold()) if len(w) > 2]
+
+
+@dataclass
+class Chunk:
+    source: str
+    text: str
+    position: int
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    stats: dict = field(default_factory=dict)
+
+
+def chunk_text(text: str, source: str, max_chars: int = 600) -> list[Chunk]:
+    """Metni cümle sınırlarından `max_chars` boyutunu aşmayan parçalara böler."""
+    chunks, current = [], ''
+    for sentence in _SENTENCE_RE.split(text or ''):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ''
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > max_chars // 2 else max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = ''
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return [Chunk(source, c, i) for i, c in enumerate(chunks)]
+
+
+class MinHasher:
+    """Kelime shingle'ları üzerinde MinHash imzası ve LSH bantları."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        state = seed
+        self._perms = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+            a = (state >> 3) % (_MERSENNE_PRIME - 1) + 1
+            state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+            b = (state >> 3) % _MERSENNE_PRIME
+            self._perms.append((a, b))
+
+    def shingles(self, text: str) -> set[int]:
+        words = _WORD_RE.findall(text.casefold())
+        if len(words) < self.shingle_size:
+            words = words or ['']
+            grams = [' '.join(words)]
+        else:
+            grams = (' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1))
+        return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'big') for g in grams}
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        hashes = self.shingles(text)
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+    def band_keys(self, signature: tuple[int, ...]) -> list[tuple]:
+        return [(i, signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    @staticmethod
+    def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def deduplicate(chunks: list[Chunk], threshold: float = 0.8, hasher: MinHasher | None = None) -> tuple[list[Chunk], int]:
+    """İlk görüleni tutarak neredeyse aynı parçaları eler; (kalanlar, elenen sayısı) döndürür."""
+    hasher = hasher or MinHasher()
+    buckets: dict[tuple, list[int]] = {}
+    signatures: list[tuple[int, ...]] = []
+    exact = set()
+    kept, removed = [], 0
+    for chunk in chunks:
+        normalized = ' '.join(_WORD_RE.findall(chunk.text.casefold()))
+        if normalized in exact:
+            removed += 1
+            continue
+        signature = hasher.signature(chunk.text)
+        keys = hasher.band_keys(signature)
+        candidates = {idx for key in keys for idx in buckets.get(key, ())}
+        if any(hasher.similarity(signature, signatures[idx]) >= threshold for idx in candidates):
+            removed += 1
+            continue
+        exact.add(normalized)
+        for key in keys:
+            buckets.setdefault(key, []).append(len(signatures))
+        signatures.append(signature)
+        kept.append(chunk)
+    return kept, removed
+
+
+def rank(chunks: list[Chunk], focuses: list[str], k1: float = 1.2, b: float = 0.75) -> list[Chunk]:
+    """Her parçayı analiz odaklarına göre BM25 ile puanlar (odaklar arası en yüksek puan + kapsam payı)."""
+    docs = [tokenize(c.text) for c in chunks]
+    queries = [set(tokenize(f)) for f in focuses if f and f.strip()]
+    if not chunks:
+        return chunks
+    avg_len = sum(len(d) for d in docs) / len(docs) or 1.0
+    df: dict[str, int] = {}
+    for doc in docs:
+        for term in set(doc):
+            df[term] = df.get(term, 0) + 1
+    n = len(docs)
+    idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+    for chunk, doc in zip(chunks, docs):
+        if not queries:
+            chunk.score = 0.0
+            continue
+        tf: dict[str, int] = {}
+        for term in doc:
+            tf[term] = tf.get(term, 0) + 1
+        norm = k1 * (1 - b + b * len(doc) / avg_len)
+        scores = []
+        for query in queries:
+            scores.append(sum(idf.get(t, 0.0) * tf[t] * (k1 + 1) / (tf[t] + norm) for t in query if t in tf))
+        matched = sum(1 for s in scores if s > 0)
+        chunk.score = max(scores) + 0.25 * (matched - 1 if matched else 0)
+    return chunks
+
+
+def pack(chunks: list[Chunk], budget_tokens: int, source_decay: float = 0.85) -> list[Chunk]:
+    """Puanı yüksek parçaları bütçeye sığdırır; aynı kaynaktan art arda seçimlerde puan azaltılır
+    ki tek bir uzun sayfa bütçeyi tüketmesin. Seçilenler kaynak ve metin sırasına göre döner."""
+    remaining = list(chunks)
+    picked_per_source: dict[str, int] = {}
+    selected, used = [], 0
+    while remaining:
+        best = max(remaining, key=lambda c: c.score * source_decay ** picked_per_source.get(c.source, 0))
+        remaining.remove(best)
+        if used + best.tokens > budget_tokens:
+            continue
+        selected.append(best)
+        used += best.tokens
+        picked_per_source[best.source] = picked_per_source.get(best.source, 0) + 1
+    order = {source: i for i, source in enumerate(dict.fromkeys(c.source for c in chunks))}
+    return sorted(selected, key=lambda c: (order[c.source], c.position))
+
+
+def compact(sources: list[tuple[str, str]], focuses: list[str], budget_tokens: int,
+            chunk_chars: int = 600, dedup_threshold: float = 0.8) -> CompactionResult:
+    """(kaynak, metin) listesini odaklara göre sıkıştırır ve kaynak başlıklı tek metin döndürür."""
+    chunks = [c for source, text in sources for c in chunk_text(text, source, chunk_chars)]
+    input_tokens = sum(c.tokens for c in chunks)
+    unique, duplicates = deduplicate(chunks, dedup_threshold)
+    selected = pack(rank(unique, focuses), budget_tokens)
+
+    parts, current = [], None
+    for chunk in selected:
+        if chunk.source != current:
+            current = chunk.source
+            parts.append(f"\n--- KAYNAK: {current} ---\n")
+        parts.append(chunk.text)
+    text = '\n'.join(parts).strip()
+    return CompactionResult(text, {
+        'sources': len(sources),
+        'chunks': len(chunks),
+        'duplicates': duplicates,
+        'selected': len(selected),
+        'input_tokens': input_tokens,
+        'output_tokens': estimate_tokens(text),
+    })
@@ -0,0 +1,128 @@
+# components.py
+# Ağır alt sistemler (agno, vektör DB, bilgi tabanı, model/araç kütüphaneleri) için tembel
+# başlatma kaydı. Her bileşen bir import adımı ve bir init adımı olarak kaydedilir; ilk
+# kullanımda ya da arka plan ısınmasında bir kez çalıştırılır ve süreleri ayrı ayrı ölçülür.
+import asyncio
+import threading
+import time
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class Component:
+    def __init__(self, name: str, importer, initializer=None, deps: tuple = ()):
+        self.name = name
+        self.importer = importer
+        self.initializer = initializer
+        self.deps = deps
+        self.state = PENDING
+        self.value = None
+        self.error = None
+        self.import_seconds = None
+        self.init_seconds = None
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        return {
+            'state': self.state,
+            'import_seconds': self.import_seconds,
+            'init_seconds': self.init_seconds,
+            'deps': list(self.deps),
+            'error': self.error,
+        }
+
+
+class ComponentRegistry:
+    def __init__(self):
+        self._components: dict[str, Component] = {}
+        self.created_at = time.time()
+        self.warmup_started_at = None
+        self.warmup_finished_at = None
+
+    def register(self, name: str, importer, initializer=None, deps: tuple = ()):
+        """`importer()` modülleri yükler; `initializer(imported, *deps)` örneği kurar."""
+        self._components[name] = Component(name, importer, initializer, deps)
+
+    def get(self, name: str):
+        """Bileşeni (gerekirse bağımlılıklarıyla birlikte) başlatır ve döndürür. Thread-safe."""
+        component = self._components[name]
+        if component.state == READY:
+            return component.value
+        deps = [self.get(dep) for dep in component.deps]
+        with component.lock:
+            if component.state == READY:
+                return component.value
+            if component.state == FAILED:
+                raise RuntimeError(f"Component '{name}' failed to initialize: {component.error}")
+            component.state = LOADING
+            try:
+                started = time.perf_counter()
+                imported = component.importer()
+                component.import_seconds = round(time.perf_counter() - started, 4)
+                started = time.perf_counter()
+                if component.initializer is not None:
+                    component.value = component.initializer(imported, *deps)
+                else:
+                    component.value = imported
+                component.init_seconds = round(time.perf_counter() - started, 4)
+                component.state = READY
+            except Exception as e:
+                component.state = FAILED
+                component.error = f"{type(e).__name__}: {e}"
+                raise RuntimeError(f"Component '{name}' failed to initialize: {component.error}") from e
+        return component.value
+
+    async def aget(self, name: str):
+        """Async bağlamlar için: başlatma paylaşılan event loop'u bloklamasın diye thread'de yapılır."""
+        component = self._components[name]
+        if component.state == READY:
+            return component.value
+        return await asyncio.to_thread(self.get, name)
+
+    def warm_up(self, names=None) -> bool:
+        """Bileşenleri kayıt sırasıyla başlatır; tümü hazırsa True döner."""
+        self.warmup_started_at = time.time()
+        ok = True
+        for name in names or list(self._components):
+            try:
+                self.get(name)
+            except Exception as e:
+                ok = False
+                print(f"Startup: component '{name}' failed: {e}")
+        self.warmup_finished_at = time.time()
+        return ok
+
+    def warm_up_in_background(self, names=None, on_done=None) -> threading.Thread:
+        def _run():
+            ok = self.warm_up(names)
+            if on_done is not None:
+                on_done(ok)
+        thread = threading.Thread(target=_run, name='component-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def ready(self) -> bool:
+        return all(c.state == READY for c in self._components.values())
+
+    def report(self) -> dict:
+        components = {name: c.to_dict() for name, c in self._components.items()}
+        return {
+            'ready': self.ready,
+            'components': components,
+            'total_import_seconds': round(sum(c.import_seconds or 0 for c in self._components.values()), 4),
+            'total_init_seconds': round(sum(c.init_seconds or 0 for c in self._components.values()), 4),
+            'warmup_seconds': (
+                round(self.warmup_finished_at - self.warmup_started_at, 4)
+                if self.warmup_started_at and self.warmup_finished_at else None
+            ),
+        }
+
+    def format_report(self) -> str:
+        lines = [f"{'component':<20}{'state':<10}{'import s':>10}{'init s':>10}"]
+        for name, c in self._components.items():
+            lines.append(f"{name:<20}{c.state:<10}{c.import_seconds or 0:>10.3f}{c.init_seconds or 0:>10.3f}")
+        return '\n'.join(lines)
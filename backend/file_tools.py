@@ -0,0 +1,59 @@
+# file_tools.py
+# MCP filesystem sunucusunun write_file/read_file arayüzünün süreç içi karşılığı: alt süreç
+# başlatmadan, verilen kök dizinle sınırlı olarak dosya yazar/okur.
+from pathlib import Path
+
+from agno.tools import Toolkit
+
+
+class LocalFileTools(Toolkit):
+    def __init__(self, root: Path, **kwargs):
+        super().__init__(name="local_file_tools", **kwargs)
+        self.root = Path(root).resolve()
+        self.register(self.write_file)
+        self.register(self.read_file)
+
+    def _resolve(self, path: str) -> Path:
+        candidate = Path(path)
+        if not candidate.is_absolute():
+            # Talimatlardaki 'output/dosya.md' gibi kök dizin adıyla başlayan göreli yolları da kabul et
+            parts = candidate.parts
+            if parts and parts[0] == self.root.name:
+                candidate = Path(*parts[1:]) if len(parts) > 1 else Path('.')
+            candidate = self.root / candidate
+        resolved = candidate.resolve()
+        if resolved != self.root and self.root not in resolved.parents:
+            raise ValueError(f"Access denied - path outside allowed directory: {path}")
+        return resolved
+
+    def write_file(self, path: str, content: str) -> str:
+        """Create a new file or completely overwrite an existing file with new content.
+
+        Args:
+            path (str): Path of the file to write.
+            content (str): Full content of the file.
+
+        Returns:
+            str: Confirmation message or error description.
+        """
+        try:
+            target = self._resolve(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content, encoding='utf-8')
+            return f"Successfully wrote to {path}"
+        except Exception as e:
+            return f"Error writing {path}: {str(e)}"
+
+    def read_file(self, path: str) -> str:
+        """Read the complete contents of a file.
+
+        Args:
+            path (str): Path of the file to read.
+
+        Returns:
+            str: File content or error description.
+        """
+        try:
+            return self._resolve(path).read_text(encoding='utf-8')
+        except Exception as e:
+            return f"Error reading {path}: {str(e)}"
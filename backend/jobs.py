@@ -0,0 +1,198 @@
+# jobs.py
+# Arka plan iş motoru: uzun süren ajan çalıştırmalarını Flask işçi thread'lerini
+# bloklamadan, paylaşılan tek bir asyncio döngüsünde sınırlı eşzamanlılıkla yürütür.
+import asyncio
+import threading
+import time
+import uuid
+
+# İş durumları
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    """Kuyrukta bekleyen iş sayısı sınıra ulaştığında fırlatılır."""
+
+
+class BackgroundLoop:
+    """Ayrı bir daemon thread'de sürekli çalışan, paylaşılan asyncio döngüsü."""
+
+    def __init__(self, name: str = "agent-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_forever(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Coroutine'i döngüye gönderir, concurrent.futures.Future döndürür."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float | None = None):
+        """Coroutine'i döngüde çalıştırır ve sonucunu bekler (senkron çağıranlar için)."""
+        return self.submit(coro).result(timeout)
+
+
+class Job:
+    def __init__(self, kind: str, session_id: str | None = None):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.session_id = session_id
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.future = None
+        # İlerleme olayları (SSE için); sıra numarası listedeki indekstir
+        self.events: list[tuple[str, dict]] = []
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def emit(self, event: str, data: dict | None = None):
+        """Thread-safe olarak bir ilerleme olayı ekler ve bekleyen dinleyicileri uyandırır."""
+        with self._cond:
+            self.events.append((event, data or {}))
+            self._cond.notify_all()
+
+    def iter_events(self, after: int = -1, heartbeat: float = 15.0):
+        """`after` indeksinden sonraki olayları (indeks, olay, veri) olarak üretir.
+
+        `heartbeat` saniye boyunca yeni olay gelmezse bağlantıyı canlı tutmak için None
+        üretir. İş bittiğinde ve tüm olaylar tüketildiğinde sona erer.
+        """
+        idx = after + 1
+        while True:
+            with self._cond:
+                if idx >= len(self.events) and not self.done:
+                    self._cond.wait(heartbeat)
+                pending = self.events[idx:]
+                finished = self.done
+            if not pending:
+                if finished:
+                    return
+                yield None
+                continue
+            for event, data in pending:
+                yield idx, event, data
+                idx += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'session_id': self.session_id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """İşleri kuyruğa alır, en fazla `max_concurrency` tanesini aynı anda çalıştırır.
+
+    `max_queue` dolduğunda yeni işler QueueFullError ile reddedilir. Tamamlanan işler
+    `retention_seconds` boyunca durum/sonuç sorguları için saklanır.
+    """
+
+    def __init__(self, loop: BackgroundLoop, max_concurrency: int = 4, max_queue: int = 16,
+                 retention_seconds: int = 3600):
+        self.loop = loop
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def submit(self, kind: str, coro_factory, session_id: str | None = None) -> Job:
+        """`coro_factory(job)` ile oluşturulan coroutine'i arka planda çalıştırır."""
+        with self._lock:
+            self._prune()
+            queued = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+            if queued >= self.max_queue:
+                raise QueueFullError(f"Too many queued runs ({queued}/{self.max_queue})")
+            job = Job(kind, session_id=session_id)
+            self._jobs[job.id] = job
+        job.future = self.loop.submit(self._execute(job, coro_factory))
+        job.future.add_done_callback(lambda fut: self._on_done(job, fut))
+        return job
+
+    @staticmethod
+    def _on_done(job: Job, fut):
+        # Henüz başlamadan iptal edilen işler _execute gövdesine hiç girmez
+        if fut.cancelled():
+            JobManager._finish(job, CANCELLED, 'cancelled')
+
+    @staticmethod
+    def _finish(job: Job, status: str, event: str, data: dict | None = None):
+        # Tek seferlik: iptal ile tamamlanma yarışırsa ilk gelen kazanır. Son olay, durumla
+        # aynı kilit altında eklenir ki iter_events onu kaçırmasın.
+        with job._cond:
+            if job.done:
+                return
+            job.finished_at = time.time()
+            job.status = status
+            job.emit(event, data if data is not None else job.to_dict())
+
+    async def _execute(self, job: Job, coro_factory):
+        try:
+            async with self._semaphore:
+                job.status = RUNNING
+                job.started_at = time.time()
+                job.emit('started', {'job_id': job.id, 'session_id': job.session_id})
+                job.result = await coro_factory(job)
+                self._finish(job, SUCCEEDED, 'result', job.result)
+                return job.result
+        except asyncio.CancelledError:
+            self._finish(job, CANCELLED, 'cancelled')
+            raise
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED, 'error', {'error': job.error})
+            raise
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None or job.done or job.future is None:
+            return False
+        return job.future.cancel()
+
+    def active_session_ids(self) -> set:
+        with self._lock:
+            return {j.session_id for j in self._jobs.values() if not j.done and j.session_id}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for j in self._jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'jobs': counts,
+        }
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [jid for jid, j in self._jobs.items()
+                   if j.done and j.finished_at is not None and j.finished_at < cutoff]
+        for jid in expired:
+            del self._jobs[jid]
@@ -0,0 +1,209 @@
+# kb_indexer.py
+# Bilgi tabanı için artımlı indeksleyici: kb/ altındaki markdown dosyalarının içerik
+# hash'lerini bir manifestte tutar ve yalnızca eklenen, değişen veya silinen dosyaları
+# yeniden parçalayıp gömer. Sunucu açılışında arka planda çalışır, ardından dizini
+# belirli aralıklarla yoklayarak yeni/değişen dosyaları yakalar.
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open('rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class KnowledgeIndexer:
+    def __init__(self, knowledge_base, kb_dir: Path, manifest_path: Path, poll_interval: float = 30.0):
+        self.knowledge_base = knowledge_base
+        self.kb_dir = Path(kb_dir)
+        self.manifest_path = Path(manifest_path)
+        self.poll_interval = poll_interval
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_sync = None
+        self.last_error = None
+        self.syncs = 0
+
+    # --- Manifest ---
+    def _load_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict):
+        tmp = self.manifest_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp.replace(self.manifest_path)
+
+    def scan(self) -> dict:
+        """kb/ altındaki markdown dosyalarının göreli yol -> (mtime_ns, boyut) eşlemesi."""
+        files = {}
+        for path in sorted(self.kb_dir.rglob('*.md')):
+            if path.is_file():
+                st = path.stat()
+                files[path.relative_to(self.kb_dir).as_posix()] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    # --- Vektör veritabanı işlemleri ---
+    def _clear_index(self):
+        vector_db = self.knowledge_base.vector_db
+        vector_db.drop()
+        vector_db.create()
+
+    def _delete_documents(self, names):
+        """Verilen adlara sahip tüm satırları siler; tablo sync başına bir kez taranır."""
+        names = set(names)
+        if not names:
+            return
+        vector_db = self.knowledge_base.vector_db
+        delete_by_name = getattr(vector_db, 'delete_by_name', None)
+        if callable(delete_by_name):
+            for name in names:
+                delete_by_name(name)
+            return
+        # LanceDb satırları doküman adını JSON payload sütununda (ASCII kaçışlı) taşır; ad
+        # karşılaştırması payload çözülerek yapılır, silme satır kimlikleriyle
+        table = getattr(vector_db, 'table', None)
+        if table is None:
+            return
+        rows = table.to_arrow().select(['id', 'payload']).to_pylist()
+        ids = [row['id'] for row in rows if json.loads(row['payload']).get('name') in names]
+        for i in range(0, len(ids), 500):
+            quoted = ', '.join("'" + id_.replace("'", "''") + "'" for id_ in ids[i:i + 500])
+            table.delete(f"id IN ({quoted})")
+
+    def _index_file(self, path: Path, name: str):
+        documents = self.knowledge_base.reader.read(file=path)
+        # Okuyucu adı dosya adından (stem) üretir; farklı klasörlerdeki aynı adlı dosyalar
+        # çakışmasın diye KB köküne göreli yol kullanılır
+        for document in documents:
+            document.name = name
+        if documents:
+            self.knowledge_base.load_documents(documents, upsert=True, skip_existing=False)
+
+    # --- Senkronizasyon ---
+    def sync(self, full: bool = False) -> dict:
+        """Diskteki KB ile indeksi eşitler; yalnızca değişen dosyalar yeniden gömülür.
+
+        Manifest yoksa (ilk açılış veya stem adlı satırlar üreten eski sürümden geçiş) ya da
+        full=True ise tablo sıfırlanıp tüm dosyalar baştan indekslenir.
+        """
+        with self._sync_lock:
+            started = time.perf_counter()
+            manifest = self._load_manifest()
+            fresh = full or not self.manifest_path.exists()
+            current = self.scan()
+            summary = {'added': [], 'changed': [], 'deleted': [], 'unchanged': 0, 'errors': {}}
+
+            if fresh:
+                self._clear_index()
+                summary['deleted'] = [rel for rel in manifest if rel not in current]
+                manifest = {}
+            else:
+                removed = [rel for rel in manifest if rel not in current]
+                try:
+                    self._delete_documents(manifest[rel].get('name') or rel for rel in removed)
+                    for rel in removed:
+                        del manifest[rel]
+                    summary['deleted'] = removed
+                except Exception as e:
+                    summary['errors'].update((rel, str(e)) for rel in removed)
+
+            pending = []
+            for rel, (mtime_ns, size) in current.items():
+                previous = manifest.get(rel)
+                # Hash yalnızca mtime/boyut değiştiyse hesaplanır; dokunulmuş ama içeriği aynı
+                # dosyalar yeniden gömülmez
+                if (previous and previous.get('name') == rel
+                        and previous.get('mtime_ns') == mtime_ns and previous.get('size') == size):
+                    summary['unchanged'] += 1
+                    continue
+                try:
+                    digest = _file_hash(self.kb_dir / rel)
+                except OSError as e:
+                    summary['errors'][rel] = str(e)
+                    continue
+                if previous and previous.get('sha256') == digest and previous.get('name') == rel:
+                    previous.update(mtime_ns=mtime_ns, size=size)
+                    summary['unchanged'] += 1
+                    continue
+                pending.append((rel, digest, mtime_ns, size))
+
+            # Değişen dosyaların eski satırları tek seferde silinir (eski manifest kayıtları stem
+            # ile anahtarlanmış olabilir); yeni eklenen dosyalar için silme gerekmez
+            replaced = [rel for rel, *_ in pending if rel in manifest]
+            try:
+                self._delete_documents({manifest[rel].get('name') or rel for rel in replaced} | set(replaced))
+            except Exception as e:
+                summary['errors'].update((rel, str(e)) for rel in replaced)
+                pending = [item for item in pending if item[0] not in manifest]
+
+            for rel, digest, mtime_ns, size in pending:
+                previous = manifest.get(rel)
+                try:
+                    self._index_file(self.kb_dir / rel, rel)
+                    manifest[rel] = {
+                        'sha256': digest,
+                        'name': rel,
+                        'mtime_ns': mtime_ns,
+                        'size': size,
+                        'indexed_at': time.time(),
+                    }
+                    summary['changed' if previous else 'added'].append(rel)
+                except Exception as e:
+                    # Yarım kalmış ekleme bir sonraki denemede silinsin diye dosya izlenir
+                    manifest.setdefault(rel, {'name': rel})
+                    summary['errors'][rel] = str(e)
+
+            self._save_manifest(manifest)
+            summary['duration_seconds'] = round(time.perf_counter() - started, 3)
+            summary['finished_at'] = time.time()
+            self.last_sync = summary
+            self.last_error = None
+            self.syncs += 1
+            return summary
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                summary = self.sync()
+                if summary['added'] or summary['changed'] or summary['deleted']:
+                    print(f"Knowledge base sync: +{len(summary['added'])} ~{len(summary['changed'])} "
+                          f"-{len(summary['deleted'])} ({summary['duration_seconds']}s)")
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Knowledge base sync error: {e}")
+            if self.poll_interval <= 0:
+                return
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        """İlk eşitlemeyi ve (poll_interval > 0 ise) dizin izlemeyi arka planda başlatır."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='kb-indexer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> dict:
+        return {
+            'kb_dir': str(self.kb_dir),
+            'indexed_files': len(self._load_manifest()),
+            'poll_interval': self.poll_interval,
+            'watching': self._thread is not None and self._thread.is_alive(),
+            'syncing': self._sync_lock.locked(),
+            'syncs': self.syncs,
+            'last_sync': self.last_sync,
+            'last_error': self.last_error,
+        }
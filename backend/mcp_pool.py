@@ -0,0 +1,153 @@
+# mcp_pool.py
+# Uzun ömürlü MCP dosya sistemi oturumları havuzu. Her yuva kendi görevinde bir MCPTools
+# bağlamını açık tutar (anyio iptal kapsamları aynı görevde kapanmalıdır); çalıştırmalar
+# bir oturumu ödünç alır ve işi bitince geri verir. Bozulan oturumlar ping ile tespit
+# edilip üstel bekleme ile yeniden başlatılır.
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+
+class _Slot:
+    def __init__(self, index: int):
+        self.index = index
+        self.tools = None
+        self.generation = 0
+        self.healthy = False
+        self.in_use = False
+        self.restarts = 0
+        self.last_error = None
+        self.started_at = None
+        self.restart = asyncio.Event()
+        self.task = None
+
+    def to_dict(self) -> dict:
+        return {
+            'index': self.index,
+            'healthy': self.healthy,
+            'in_use': self.in_use,
+            'restarts': self.restarts,
+            'started_at': self.started_at,
+            'last_error': self.last_error,
+        }
+
+
+class MCPSessionPool:
+    def __init__(self, factory, size: int = 2, health_interval: float = 30.0, ping_timeout: float = 5.0):
+        """`factory()` her çağrıda yeni bir (async context manager) MCPTools örneği döndürmelidir."""
+        self._factory = factory
+        self.size = max(1, size)
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+        self._slots: list[_Slot] = []
+        self._available: asyncio.Queue | None = None
+        self._health_task = None
+        self._started = False
+        self._closed = False
+
+    async def start(self):
+        """Yuvaları başlatır; paylaşılan event loop içinden çağrılmalıdır. Tekrar çağrılabilir."""
+        if self._started:
+            return
+        self._started = True
+        self._available = asyncio.Queue()
+        for i in range(self.size):
+            slot = _Slot(i)
+            slot.task = asyncio.create_task(self._hold(slot), name=f'mcp-slot-{i}')
+            self._slots.append(slot)
+        if self.health_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop(), name='mcp-health')
+
+    async def _hold(self, slot: _Slot):
+        backoff = 1.0
+        while not self._closed:
+            try:
+                async with self._factory() as tools:
+                    slot.tools = tools
+                    slot.generation += 1
+                    slot.healthy = True
+                    slot.started_at = time.time()
+                    slot.restart.clear()
+                    backoff = 1.0
+                    self._available.put_nowait((slot, slot.generation))
+                    await slot.restart.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                slot.last_error = f"{type(e).__name__}: {e}"
+            slot.healthy = False
+            slot.tools = None
+            if self._closed:
+                return
+            slot.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _ping(self, slot: _Slot) -> bool:
+        session = getattr(slot.tools, 'session', None)
+        if session is None or not hasattr(session, 'send_ping'):
+            return slot.tools is not None
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout=self.ping_timeout)
+            return True
+        except Exception as e:
+            slot.last_error = f"ping failed: {type(e).__name__}: {e}"
+            return False
+
+    def _mark_broken(self, slot: _Slot):
+        slot.healthy = False
+        slot.restart.set()
+
+    async def _health_loop(self):
+        while not self._closed:
+            await asyncio.sleep(self.health_interval)
+            # Yalnızca boştaki oturumlar kontrol edilir; kullanımdakiler iade edilirken kontrol edilir
+            idle = []
+            while not self._available.empty():
+                idle.append(self._available.get_nowait())
+            for slot, generation in idle:
+                if generation != slot.generation or not slot.healthy:
+                    continue
+                if await self._ping(slot):
+                    self._available.put_nowait((slot, generation))
+                else:
+                    self._mark_broken(slot)
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float | None = None):
+        """Sağlıklı bir MCPTools oturumunu ödünç verir."""
+        await self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            slot, generation = await asyncio.wait_for(self._available.get(), timeout=remaining)
+            # Yeniden başlatılmış yuvaların eski kuyruk kayıtları atlanır
+            if generation != slot.generation or not slot.healthy:
+                continue
+            break
+        slot.in_use = True
+        try:
+            yield slot.tools
+        finally:
+            slot.in_use = False
+            if not self._closed:
+                if await self._ping(slot):
+                    self._available.put_nowait((slot, generation))
+                else:
+                    self._mark_broken(slot)
+
+    async def close(self):
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+        for slot in self._slots:
+            slot.restart.set()
+        await asyncio.gather(*(s.task for s in self._slots if s.task), return_exceptions=True)
+
+    def status(self) -> dict:
+        return {
+            'size': self.size,
+            'started': self._started,
+            'available': self._available.qsize() if self._available is not None else 0,
+            'slots': [s.to_dict() for s in self._slots],
+        }
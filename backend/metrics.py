@@ -0,0 +1,196 @@
+# metrics.py
+# Süreç içi metrik kaydı (sayaç, gösterge, histogram) ve çalıştırma başına iz (trace).
+# Metrikler /metrics ucundan Prometheus metin formatında okunur; iz, çalıştırma dizinine
+# trace.json olarak yazılır. Etkin iz contextvar ile taşınır, asyncio.to_thread ile açılan
+# thread'lere de geçer.
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+current_trace: contextvars.ContextVar = contextvars.ContextVar('current_trace', default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = ''):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._meta: dict[str, tuple[str, str, tuple]] = {}
+        self._values: dict[str, dict[tuple, object]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: tuple = DEFAULT_BUCKETS):
+        with self._lock:
+            self._meta[name] = (kind, help_text, buckets)
+            self._values.setdefault(name, {})
+
+    def _series(self, name: str, kind: str) -> dict:
+        if name not in self._meta:
+            self._meta[name] = (kind, '', DEFAULT_BUCKETS)
+        return self._values.setdefault(name, {})
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name, COUNTER)
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series(name, GAUGE)[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name, HISTOGRAM)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._meta[name][2])
+            histogram.observe(value)
+
+    def record(self, name: str, seconds: float, span: str | None = None, trace=None, **labels):
+        """Süreyi histograma yazar; `span` verilmişse etkin (ya da verilen) ize de ekler."""
+        self.observe(name, seconds, **labels)
+        trace = trace if trace is not None else current_trace.get()
+        if span and trace is not None:
+            trace.add_span(span, seconds, **labels)
+
+    @contextmanager
+    def timed(self, name: str, span: str | None = None, **labels):
+        """Bloğun süresini ölçer; hata durumunda ize status='error' olarak düşer."""
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            self.observe(name, seconds, **labels)
+            trace = current_trace.get()
+            if span and trace is not None:
+                trace.add_span(span, seconds, status=status, **labels)
+
+    def value(self, name: str, **labels):
+        with self._lock:
+            found = self._values.get(name, {}).get(tuple(sorted(labels.items())))
+        if isinstance(found, _Histogram):
+            return {'count': found.count, 'sum': found.sum}
+        return found
+
+    def render(self) -> str:
+        """Prometheus metin formatı (0.0.4)."""
+        lines = []
+        with self._lock:
+            for name, series in self._values.items():
+                kind, help_text, _ = self._meta[name]
+                full = self.prefix + name
+                if help_text:
+                    lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                for labels, value in sorted(series.items()):
+                    if isinstance(value, _Histogram):
+                        for bound, count in zip(value.buckets, value.counts):
+                            lines.append(f"{full}_bucket{_format_labels(labels, (('le', _format_value(float(bound))),))} {count}")
+                        lines.append(f"{full}_bucket{_format_labels(labels, (('le', '+Inf'),))} {value.count}")
+                        lines.append(f"{full}_sum{_format_labels(labels)} {_format_value(round(value.sum, 6))}")
+                        lines.append(f"{full}_count{_format_labels(labels)} {value.count}")
+                    else:
+                        lines.append(f"{full}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class RunTrace:
+    """Tek bir çalıştırmanın aşama/ajan/araç sürelerini ve sayaçlarını toplar."""
+
+    def __init__(self, run_id: str, **attrs):
+        self.run_id = run_id
+        self.attrs = attrs
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.finished_at = None
+        self.status = None
+        self.spans = []
+        self.counts: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, kind: str, seconds: float, **attrs):
+        # Başlangıç, çalıştırma başından itibaren göreli saniye olarak tutulur
+        end = time.perf_counter() - self._t0
+        with self._lock:
+            self.spans.append({
+                'kind': kind,
+                'start': round(max(0.0, end - seconds), 4),
+                'seconds': round(seconds, 4),
+                **attrs,
+            })
+
+    def incr(self, name: str, amount: float = 1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def finish(self, status: str):
+        self.status = status
+        self.finished_at = time.time()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+            counts = dict(self.counts)
+        return {
+            'run_id': self.run_id,
+            **self.attrs,
+            'status': self.status,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_seconds': round((self.finished_at or time.time()) - self.started_at, 4),
+            'counts': counts,
+            'spans': spans,
+        }
+
+    def save(self, path: Path):
+        path = Path(path)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+        tmp.replace(path)
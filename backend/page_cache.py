@@ -0,0 +1,137 @@
+# page_cache.py
+# read_articles için disk tabanlı sayfa önbelleği: normalize edilmiş URL'ye göre çıkarılmış
+# metni, ETag ve Last-Modified bilgisiyle SQLite'ta saklar. TTL dolan kayıtlar koşullu
+# istekle yeniden doğrulanır; toplam boyut sınırı aşılınca en eski erişilenler silinir (LRU).
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = ('utm_', 'gclid', 'fbclid', 'yclid', 'mc_cid', 'mc_eid')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """Aynı sayfayı gösteren URL'leri tek bir anahtara indirger."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'http'
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ''))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    text: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return (time.time() - self.fetched_at) < ttl_seconds
+
+
+class PageCache:
+    def __init__(self, path: Path, ttl_seconds: float = 6 * 3600, max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages(last_access)")
+        self._conn.commit()
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stale_served': 0,
+            'partial': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def get(self, url: str) -> CachedPage | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, text, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE pages SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CachedPage(*row)
+
+    def put(self, url: str, text: str, etag: str | None = None, last_modified: str | None = None):
+        now = time.time()
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO pages (url, text, etag, last_modified, fetched_at, last_access, size)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (url, text, etag, last_modified, now, now, size),
+            )
+            self.counters['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """304 Not Modified sonrası kaydın tazelik süresini yeniler."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self.counters['evictions'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['revalidated'] + counters['misses']
+        return {
+            **counters,
+            'entries': entries,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'hit_rate': round((counters['hits'] + counters['revalidated']) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,179 @@
+# plan_cache.py
+# /generate-plan için plan önbelleği: normalize edilmiş mesaj + gün anahtarıyla üretilen planı
+# SQLite'ta saklar. İsteğe bağlı olarak mesaj gömmesi de tutulur; birebir eşleşme yoksa aynı
+# günün son istekleri arasında kosinüs benzerliği eşiği aşan plan döndürülür. TTL dolan
+# kayıtlar kullanılmaz, kayıt sayısı sınırı aşılınca en eski erişilenler silinir (LRU).
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+_PUNCT_RE = re.compile(r'[^\w\s]', re.UNICODE)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_message(text: str) -> str:
+    """Büyük/küçük harf, noktalama ve boşluk farklarını yok sayan kanonik biçim (Türkçe İ/I dahil)."""
+    text = unicodedata.normalize('NFKC', text or '')
+    text = text.replace('İ', 'i').replace('I', 'ı').lower()
+    text = _PUNCT_RE.sub(' ', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _pack(embedding) -> bytes | None:
+    if not embedding:
+        return None
+    norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+    return array('f', (x / norm for x in embedding)).tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector
+
+
+@dataclass
+class PlanMatch:
+    plan: dict
+    match: str
+    similarity: float
+    created_at: float
+
+
+class PlanCache:
+    def __init__(self, path: Path, ttl_seconds: float = 24 * 3600, max_entries: int = 1000,
+                 similarity_threshold: float = 0.95, similarity_candidates: int = 200):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.similarity_candidates = similarity_candidates
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS plans (
+                key TEXT PRIMARY KEY,
+                day TEXT NOT NULL,
+                message TEXT NOT NULL,
+                plan TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plans_day_access ON plans(day, last_access)")
+        self._conn.commit()
+        self.counters = {
+            'exact_hits': 0,
+            'semantic_hits': 0,
+            'misses': 0,
+            'bypassed': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    @staticmethod
+    def key(message: str, day: str) -> str:
+        return hashlib.sha256(f"{day}|{normalize_message(message)}".encode('utf-8')).hexdigest()
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def get(self, message: str, day: str) -> PlanMatch | None:
+        """Birebir (normalize edilmiş) eşleşme; sayaçları çağıran günceller."""
+        key = self.key(message, day)
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT plan, created_at FROM plans WHERE key = ? AND created_at >= ?", (key, cutoff)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE plans SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return PlanMatch(json.loads(row[0]), 'exact', 1.0, row[1])
+
+    def find_similar(self, embedding, day: str) -> PlanMatch | None:
+        """Aynı günün son erişilen kayıtları arasında en benzer planı döndürür (eşik altındaysa None)."""
+        query = _pack(embedding)
+        if query is None:
+            return None
+        query = _unpack(query)
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT key, plan, embedding, created_at FROM plans
+                   WHERE day = ? AND created_at >= ? AND embedding IS NOT NULL
+                   ORDER BY last_access DESC LIMIT ?""",
+                (day, cutoff, self.similarity_candidates),
+            ).fetchall()
+        best, best_score = None, self.similarity_threshold
+        for key, plan, blob, created_at in rows:
+            vector = _unpack(blob)
+            if len(vector) != len(query):
+                continue
+            score = sum(a * b for a, b in zip(query, vector))
+            if score >= best_score:
+                best, best_score = (key, plan, created_at), score
+        if best is None:
+            return None
+        with self._lock:
+            self._conn.execute("UPDATE plans SET last_access = ? WHERE key = ?", (time.time(), best[0]))
+            self._conn.commit()
+        return PlanMatch(json.loads(best[1]), 'semantic', round(best_score, 4), best[2])
+
+    def put(self, message: str, day: str, plan: dict, embedding=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO plans (key, day, message, plan, embedding, created_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (self.key(message, day), day, message, json.dumps(plan, ensure_ascii=False), _pack(embedding), now, now),
+            )
+            self.counters['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM plans").rowcount
+            self._conn.commit()
+        return removed
+
+    def _evict(self):
+        expired = self._conn.execute(
+            "DELETE FROM plans WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        self.counters['evictions'] += expired
+        entries = self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+        if entries <= self.max_entries:
+            return
+        overflow = entries - self.max_entries
+        self._conn.execute(
+            "DELETE FROM plans WHERE key IN (SELECT key FROM plans ORDER BY last_access ASC LIMIT ?)", (overflow,)
+        )
+        self.counters['evictions'] += overflow
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0]
+            counters = dict(self.counters)
+        lookups = counters['exact_hits'] + counters['semantic_hits'] + counters['misses']
+        return {
+            **counters,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'similarity_threshold': self.similarity_threshold,
+            'hit_rate': round((counters['exact_hits'] + counters['semantic_hits']) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,349 @@
+# roadmap.py
+# roadmap.md için yapısal doğrulayıcı. Markdown tabloyu ayrıştırır; başlıkları birebir, satır
+# sayısını, tarih biçimini/sırasını, Aşama ve Öncelik değerlerini ve yasaklı terimleri (kelime
+# başında, ekleriyle) kontrol eder ve satır/sütun düzeyinde ihlaller döndürür. Mekanik sorunlar (başlık
+# yazımı ve sırası, enum büyük/küçük harf ve eş anlamlıları, tarih biçimi) yerelde düzeltilir;
+# geri kalan satır hataları için yalnızca o satırları içeren bir onarım istemi üretilir.
+import datetime
+import re
+import unicodedata
+from dataclasses import dataclass, asdict
+
+ROADMAP_HEADERS = [
+    "Sprint/Release",
+    "Epic/Feature",
+    "User Story/Kapsam",
+    "Aşama (Discovery, Design, Build, Test, Launch)",
+    "Sorumlu (kişi/ekip)",
+    "Başlangıç (YYYY-MM-DD)",
+    "Bitiş (YYYY-MM-DD)",
+    "Öncelik (Yüksek/Orta/Düşük)",
+    "Bağımlılıklar",
+    "KPI/Metrik (ör. aktivasyon oranı, NPS, hata oranı)",
+]
+ROADMAP_REQUIRED_HEADERS = [
+    "Sprint/Release", "Epic/Feature", "User Story/Kapsam", "Aşama", "Sorumlu",
+    "Başlangıç", "Bitiş", "Öncelik", "Bağımlılıklar", "KPI/Metrik"
+]
+ROADMAP_BANNED_TERMS = [
+    "Araştırmacı", "İçerik Okuyucu", "Analist", "İş Planı Uzmanı", "Koordinatör",
+    "ajan", "adım", "süreç", "araştırma", "okuma", "analiz", "ekip", "team", "koordine", "koordinatör"
+]
+ROADMAP_MIN_ROWS = 5
+PHASES = ("Discovery", "Design", "Build", "Test", "Launch")
+PRIORITIES = ("Yüksek", "Orta", "Düşük")
+
+PHASE_COLUMN, OWNER_COLUMN, START_COLUMN, END_COLUMN, PRIORITY_COLUMN = 3, 4, 5, 6, 7
+# Sütun başlığının kendisinin istediği terimler o sütunda yasaklı sayılmaz ("Sorumlu (kişi/ekip)")
+COLUMN_ALLOWED_TERMS = {OWNER_COLUMN: ('ekip', 'team')}
+
+# Yapısal ihlaller tablonun tamamen yeniden yazılmasını gerektirir
+STRUCTURAL = ('no_table', 'headers', 'row_count')
+
+_HEADER_ALIASES = [
+    ('sprintrelease', 'sprint', 'release', 'surum'),
+    ('epicfeature', 'epic', 'feature', 'ozellik'),
+    ('userstorykapsam', 'userstory', 'kapsam'),
+    ('asama', 'phase', 'faz'),
+    ('sorumlu', 'owner', 'sahip'),
+    ('baslangic', 'baslangictarihi', 'start', 'startdate'),
+    ('bitis', 'bitistarihi', 'end', 'enddate'),
+    ('oncelik', 'priority'),
+    ('bagimliliklar', 'bagimlilik', 'dependencies'),
+    ('kpimetrik', 'kpi', 'metrik', 'metric', 'kpimetric'),
+]
+_PHASE_ALIASES = {
+    'discovery': 'Discovery', 'kesif': 'Discovery',
+    'design': 'Design', 'tasarim': 'Design',
+    'build': 'Build', 'gelistirme': 'Build', 'development': 'Build',
+    'test': 'Test', 'testing': 'Test', 'qa': 'Test',
+    'launch': 'Launch', 'lansman': 'Launch', 'yayin': 'Launch', 'canliya alma': 'Launch',
+}
+_PRIORITY_ALIASES = {
+    'yuksek': 'Yüksek', 'high': 'Yüksek', 'kritik': 'Yüksek',
+    'orta': 'Orta', 'medium': 'Orta',
+    'dusuk': 'Düşük', 'low': 'Düşük',
+}
+_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y.%m.%d', '%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_SEPARATOR_RE = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$')
+_CELL_SPLIT_RE = re.compile(r'(?<!\\)\|')
+_MARKUP_RE = re.compile(r'[*_`]')
+
+
+def _fold(text: str) -> str:
+    """Karşılaştırma anahtarı: Türkçe büyük/küçük harf ve aksan farkları yok sayılır."""
+    text = (text or '').replace('İ', 'i').replace('I', 'ı').lower()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if not unicodedata.combining(c)).replace('ı', 'i')
+
+
+def _header_key(cell: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', _fold(re.sub(r'\(.*?\)', '', cell)))
+
+
+# Kelime başında eşleşen ama yasaklı terim olmayan sözcükler (katlanmış biçimde)
+_BANNED_TERM_EXCEPTIONS = ('ekipman', 'ajanda', 'ajans')
+# Ünlüyle başlayan ek alınca yumuşayan son ünsüzler (ekip -> ekibi); ç/c katlamada zaten eşittir
+_SOFTENING = {'p': 'b', 't': 'd', 'k': 'g'}
+
+
+def _banned_pattern(term: str) -> re.Pattern:
+    """Terimi kelime başında, Türkçe ekleriyle birlikte yakalayan desen (süreç -> süreci, süreçler)."""
+    words = _fold(term).split()
+    if len(words) > 1 and re.search(r'[^aeiou][iu]$', words[-1]):
+        # Tamlamanın son kelimesindeki iyelik eki de çekimde düşer (Uzmanı -> Uzmanları)
+        words[-1] = words[-1][:-1]
+    last = words[-1]
+    if last[-1] in _SOFTENING:
+        last = re.escape(last[:-1]) + f'[{last[-1]}{_SOFTENING[last[-1]]}]'
+    else:
+        last = re.escape(last)
+    return re.compile(r'(?<!\w)' + r'\s+'.join([*map(re.escape, words[:-1]), last]) + r'\w*')
+
+
+_BANNED_PATTERNS = [(term, _banned_pattern(term)) for term in dict.fromkeys(ROADMAP_BANNED_TERMS)]
+
+
+def banned_terms_in(text: str, allowed: tuple = ()) -> list[str]:
+    """Metinde kelime başında (ekleriyle) geçen yasaklı terimler ('ekipman' 'ekip' sayılmaz)."""
+    folded = _fold(text)
+    return [
+        term for term, pattern in _BANNED_PATTERNS
+        if term not in allowed
+        and any(not m.group().startswith(_BANNED_TERM_EXCEPTIONS) for m in pattern.finditer(folded))
+    ]
+
+
+def normalize_date(value: str) -> str | None:
+    """Desteklenen biçimlerdeki tarihi YYYY-MM-DD'ye çevirir; geçersizse None."""
+    value = _MARKUP_RE.sub('', value or '').strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _is_iso_date(value: str) -> bool:
+    return bool(_ISO_DATE_RE.fullmatch(value)) and normalize_date(value) == value
+
+
+def _split_row(line: str) -> list[str]:
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip() for cell in _CELL_SPLIT_RE.split(line)]
+
+
+def _render_row(cells: list[str]) -> str:
+    return '| ' + ' | '.join(cells) + ' |'
+
+
+@dataclass
+class Violation:
+    code: str
+    message: str
+    row: int | None = None
+    column: str | None = None
+
+    def to_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@dataclass
+class RoadmapTable:
+    before: list[str]
+    header: list[str]
+    rows: list[list[str]]
+    after: list[str]
+
+    def render(self) -> str:
+        lines = [*self.before, _render_row(self.header), _render_row(['---'] * len(self.header)),
+                 *(_render_row(r) for r in self.rows), *self.after]
+        return '\n'.join(lines).rstrip('\n') + '\n'
+
+
+def parse_table(text: str) -> RoadmapTable | None:
+    """Metindeki ilk markdown tabloyu (başlık + ayraç satırı) ayrıştırır."""
+    lines = (text or '').splitlines()
+    for i in range(len(lines) - 1):
+        if '|' in lines[i] and _SEPARATOR_RE.match(lines[i + 1]):
+            end = i + 2
+            while end < len(lines) and '|' in lines[end] and lines[end].strip():
+                end += 1
+            return RoadmapTable(
+                before=lines[:i],
+                header=_split_row(lines[i]),
+                rows=[_split_row(line) for line in lines[i + 2:end]],
+                after=lines[end:],
+            )
+    return None
+
+
+def validate(text: str, min_rows: int = ROADMAP_MIN_ROWS) -> list[Violation]:
+    """Roadmap metnindeki tüm ihlalleri döndürür; boş liste geçerli demektir."""
+    table = parse_table(text)
+    if table is None:
+        return [Violation('no_table', 'Markdown tablo bulunamadı.')]
+    violations = []
+    for line in table.before + table.after:
+        for term in banned_terms_in(line):
+            violations.append(Violation('banned_term', f"Tablo dışındaki metinde yasaklı terim: '{term}'"))
+    if table.header != ROADMAP_HEADERS:
+        violations.append(Violation(
+            'headers', f"Başlıklar birebir olmalı: {' | '.join(ROADMAP_HEADERS)} (bulunan: {' | '.join(table.header)})"
+        ))
+    if len(table.rows) < min_rows:
+        violations.append(Violation('row_count', f"En az {min_rows} satır olmalı (bulunan: {len(table.rows)})."))
+    if table.header != ROADMAP_HEADERS:
+        return violations
+    for n, cells in enumerate(table.rows, start=1):
+        if len(cells) != len(ROADMAP_HEADERS):
+            violations.append(Violation('cells', f"{len(ROADMAP_HEADERS)} hücre olmalı (bulunan: {len(cells)}).", row=n))
+            continue
+        if cells[PHASE_COLUMN] not in PHASES:
+            violations.append(Violation(
+                'phase', f"Aşama şunlardan biri olmalı: {', '.join(PHASES)} (bulunan: '{cells[PHASE_COLUMN]}')",
+                row=n, column=ROADMAP_REQUIRED_HEADERS[PHASE_COLUMN],
+            ))
+        if cells[PRIORITY_COLUMN] not in PRIORITIES:
+            violations.append(Violation(
+                'priority', f"Öncelik şunlardan biri olmalı: {', '.join(PRIORITIES)} (bulunan: '{cells[PRIORITY_COLUMN]}')",
+                row=n, column=ROADMAP_REQUIRED_HEADERS[PRIORITY_COLUMN],
+            ))
+        dates_ok = True
+        for column in (START_COLUMN, END_COLUMN):
+            if not _is_iso_date(cells[column]):
+                dates_ok = False
+                violations.append(Violation(
+                    'date_format', f"Tarih YYYY-MM-DD olmalı (bulunan: '{cells[column]}')",
+                    row=n, column=ROADMAP_REQUIRED_HEADERS[column],
+                ))
+        if dates_ok and cells[START_COLUMN] > cells[END_COLUMN]:
+            violations.append(Violation(
+                'date_order', f"Başlangıç ({cells[START_COLUMN]}) Bitiş'ten ({cells[END_COLUMN]}) sonra olamaz.", row=n,
+            ))
+        for column, cell in enumerate(cells):
+            for term in banned_terms_in(cell, COLUMN_ALLOWED_TERMS.get(column, ())):
+                violations.append(Violation(
+                    'banned_term', f"Yasaklı terim: '{term}'", row=n, column=ROADMAP_REQUIRED_HEADERS[column],
+                ))
+    return violations
+
+
+def needs_regeneration(violations: list[Violation]) -> bool:
+    return any(v.code in STRUCTURAL for v in violations)
+
+
+def offending_rows(violations: list[Violation]) -> list[int]:
+    return sorted({v.row for v in violations if v.row is not None})
+
+
+def _map_headers(header: list[str]) -> list[int] | None:
+    """Her başlık hücresinin kanonik sütun indeksini döndürür; birebir eşleşme yoksa None."""
+    if len(header) != len(ROADMAP_HEADERS):
+        return None
+    order = []
+    for cell in header:
+        key = _header_key(cell)
+        index = next((i for i, aliases in enumerate(_HEADER_ALIASES) if key in aliases), None)
+        if index is None or index in order:
+            return None
+        order.append(index)
+    return order
+
+
+def _normalize_enum(value: str, aliases: dict) -> str | None:
+    return aliases.get(_fold(_MARKUP_RE.sub('', value)).strip())
+
+
+def normalize(text: str) -> tuple[str, list[str]]:
+    """Mekanik sorunları yerelde düzeltir; (yeni metin, uygulanan düzeltmeler) döndürür.
+
+    Düzeltme yoksa metin olduğu gibi döner. İçerik gerektiren hatalara (yasaklı terim içeren
+    hücreler, eksik hücreler, ters tarih aralığı) dokunulmaz.
+    """
+    table = parse_table(text)
+    if table is None:
+        return text, []
+    fixes = []
+    for part in (table.before, table.after):
+        kept = [line for line in part if not banned_terms_in(line)]
+        if len(kept) != len(part):
+            fixes.append('prose')
+            part[:] = kept
+    if table.header != ROADMAP_HEADERS:
+        order = _map_headers(table.header)
+        if order is None:
+            return (table.render(), fixes) if fixes else (text, [])
+        width = len(ROADMAP_HEADERS)
+        for n, cells in enumerate(table.rows):
+            if len(cells) == width:
+                reordered = [''] * width
+                for column, index in enumerate(order):
+                    reordered[index] = cells[column]
+                table.rows[n] = reordered
+        table.header = list(ROADMAP_HEADERS)
+        fixes.append('headers')
+    rows = [cells for cells in table.rows if any(cells)]
+    if len(rows) != len(table.rows):
+        fixes.append('empty_rows')
+        table.rows = rows
+    for cells in table.rows:
+        if len(cells) != len(ROADMAP_HEADERS):
+            continue
+        for column, aliases, fix in ((PHASE_COLUMN, _PHASE_ALIASES, 'phase'), (PRIORITY_COLUMN, _PRIORITY_ALIASES, 'priority')):
+            value = _normalize_enum(cells[column], aliases)
+            if value is not None and value != cells[column]:
+                cells[column] = value
+                fixes.append(fix)
+        for column in (START_COLUMN, END_COLUMN):
+            value = normalize_date(cells[column])
+            if value is not None and value != cells[column]:
+                cells[column] = value
+                fixes.append('date')
+    if not fixes:
+        return text, []
+    return table.render(), list(dict.fromkeys(fixes))
+
+
+def row_repair_prompt(text: str, violations: list[Violation]) -> str:
+    """Yalnızca hatalı satırları ve hatalarını içeren onarım istemi."""
+    table = parse_table(text)
+    rows = offending_rows(violations)
+    problems = '\n'.join(f"- Satır {v.row}: {v.message}" for v in violations if v.row is not None)
+    listed = '\n'.join(_render_row(table.rows[n - 1]) for n in rows)
+    return (
+        f"Aşağıdaki {len(rows)} roadmap satırını düzelt.\n"
+        f"HATALAR:\n{problems}\n\n"
+        f"SATIRLAR (sırasıyla {', '.join(str(n) for n in rows)}):\n"
+        f"{_render_row(ROADMAP_HEADERS)}\n{_render_row(['---'] * len(ROADMAP_HEADERS))}\n{listed}\n\n"
+        "KURALLAR:\n"
+        f"- Her satırda {len(ROADMAP_HEADERS)} hücre olmalı\n"
+        f"- Aşama: {', '.join(PHASES)}\n"
+        f"- Öncelik: {', '.join(PRIORITIES)}\n"
+        "- Tarihler YYYY-MM-DD ve Başlangıç <= Bitiş\n"
+        f"- Şu terimleri ekli halleriyle de kullanma (ör. süreç, süreci): {', '.join(ROADMAP_BANNED_TERMS)}\n"
+        f"ÇIKTI: Aynı başlıkla, aynı sırada tam olarak {len(rows)} satırlık markdown tablo döndür; başka metin ekleme."
+    )
+
+
+def replace_rows(text: str, rows: list[int], repaired: str) -> str | None:
+    """LLM'in döndürdüğü tablodaki satırları sırasıyla `rows` konumlarına yazar.
+
+    Yanıtta tablo yoksa ya da satır sayısı tutmuyorsa None döner.
+    """
+    table = parse_table(text)
+    fixed = parse_table(repaired)
+    if table is None or fixed is None:
+        return None
+    fixed_rows = [cells for cells in fixed.rows if any(cells)]
+    if len(fixed_rows) != len(rows) or any(n < 1 or n > len(table.rows) for n in rows):
+        return None
+    for n, cells in zip(rows, fixed_rows):
+        table.rows[n - 1] = cells
+    return table.render()
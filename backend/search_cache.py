@@ -0,0 +1,185 @@
+# search_cache.py
+# Dış arama çağrıları için kalıcı sonuç önbelleği ve hız sınırlayıcı. Önbellek normalize edilmiş
+# sorgu + sonuç sayısı + dil anahtarıyla JSON sonuç listesini SQLite'ta TTL ile saklar; aynı
+# anahtar için eşzamanlı kaçırmalar tek bir canlı aramaya indirilir. Sınırlayıcı, jeton kovası
+# (dakikadaki çağrı) ve eşzamanlılık semaforunu birlikte uygular.
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    return _SPACE_RE.sub(' ', (query or '').replace('İ', 'i').replace('I', 'ı').lower()).strip()
+
+
+class SearchCache:
+    def __init__(self, path: Path, ttl_seconds: float = 24 * 3600, max_entries: int = 5000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS searches (
+                key TEXT PRIMARY KEY,
+                results TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS searches_last_access ON searches(last_access)")
+        self._conn.commit()
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    @staticmethod
+    def key(query: str, max_results: int, language: str) -> str:
+        return f"{language}|{max_results}|{normalize_query(query)}"
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def get(self, key: str) -> list | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results FROM searches WHERE key = ? AND fetched_at >= ?", (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE searches SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, results: list):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (key, results, fetched_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(results, ensure_ascii=False), now, now),
+            )
+            self.counters['stores'] += 1
+            self._evict()
+            self._conn.commit()
+
+    def get_or_fetch(self, key: str, fetch) -> list:
+        """Önbellekte yoksa `fetch()` ile getirir; aynı anahtarı bekleyen diğer çağrılar sonucu paylaşır.
+
+        `fetch()` bir liste döndürmezse (ör. hata metni) sonuç önbelleğe yazılmaz ve olduğu gibi döner.
+        """
+        results = self.get(key)
+        if results is not None:
+            self.count('hits')
+            return results
+        with self._lock:
+            gate = self._inflight.setdefault(key, threading.Lock())
+        with gate:
+            results = self.get(key)
+            if results is not None:
+                self.count('coalesced')
+                return results
+            self.count('misses')
+            try:
+                results = fetch()
+                if isinstance(results, list):
+                    self.put(key, results)
+                return results
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def _evict(self):
+        expired = self._conn.execute(
+            "DELETE FROM searches WHERE fetched_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        self.counters['evictions'] += expired
+        entries = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+        if entries > self.max_entries:
+            overflow = entries - self.max_entries
+            self._conn.execute(
+                "DELETE FROM searches WHERE key IN (SELECT key FROM searches ORDER BY last_access ASC LIMIT ?)", (overflow,)
+            )
+            self.counters['evictions'] += overflow
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['coalesced'] + counters['misses']
+        return {
+            **counters,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hit_rate': round((counters['hits'] + counters['coalesced']) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RateLimiter:
+    """Thread'ler arası jeton kovası + eşzamanlılık sınırı; `with limiter:` ile kullanılır."""
+
+    def __init__(self, rate_per_minute: float = 30.0, burst: int = 5, max_concurrency: int = 2):
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self.calls = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _take(self) -> float:
+        """Jeton alınabiliyorsa 0, değilse beklenecek süreyi döndürür."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+
+    def __enter__(self):
+        started = time.monotonic()
+        self._semaphore.acquire()
+        while True:
+            delay = self._take()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        waited = time.monotonic() - started
+        with self._lock:
+            self.calls += 1
+            if waited > 0.001:
+                self.waits += 1
+                self.wait_seconds += waited
+        return self
+
+    def __exit__(self, *exc):
+        self._semaphore.release()
+        return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'rate_per_minute': round(self.rate * 60, 2),
+                'burst': self.burst,
+                'max_concurrency': self.max_concurrency,
+                'calls': self.calls,
+                'waits': self.waits,
+                'wait_seconds': round(self.wait_seconds, 3),
+            }
@@ -0,0 +1,67 @@
+# search_tools.py
+# GoogleSearchTools için önbellekli sarmalayıcı: aynı google_search arayüzünü sunar, sonuçları
+# SearchCache'ten verir, canlı aramaları RateLimiter'dan geçirir ve bir çalıştırma içindeki tüm
+# sorgularda aynı (normalize edilmiş) URL'yi yalnızca ilk kez döndürür. Her çalıştırma kendi
+# örneğini oluşturmalıdır; tekilleştirme durumu örnek başınadır. Sorguları eşzamanlı çalıştırıp
+# kendisi sıralı tekilleştiren çağıranlar dedupe=False ile bu durumu kapatır.
+import json
+import threading
+
+from agno.tools import Toolkit
+
+from page_cache import normalize_url
+from search_cache import SearchCache, RateLimiter
+
+
+class CachedSearchTools(Toolkit):
+    def __init__(self, backend, cache: SearchCache, limiter: RateLimiter, dedupe: bool = True, **kwargs):
+        super().__init__(name="googlesearch", **kwargs)
+        self.backend = backend
+        self.cache = cache
+        self.limiter = limiter
+        self.dedupe = dedupe
+        self.seen_urls: set[str] = set()
+        self.duplicates_dropped = 0
+        self._lock = threading.Lock()
+        self.register(self.google_search)
+
+    def _search(self, query: str, max_results: int, language: str):
+        with self.limiter:
+            raw = self.backend.google_search(query, max_results=max_results, language=language)
+        try:
+            results = json.loads(raw) if isinstance(raw, str) else raw
+        except ValueError:
+            return raw
+        return results if isinstance(results, list) else raw
+
+    def _dedupe(self, results: list) -> list:
+        unique = []
+        with self._lock:
+            for item in results:
+                url = item.get('url') if isinstance(item, dict) else None
+                if not url:
+                    continue
+                key = normalize_url(url)
+                if key in self.seen_urls:
+                    self.duplicates_dropped += 1
+                    continue
+                self.seen_urls.add(key)
+                unique.append(item)
+        return unique
+
+    def google_search(self, query: str, max_results: int = 5, language: str = "en") -> str:
+        """Use this function to search Google for a specified query.
+
+        Args:
+            query (str): The query to search for.
+            max_results (int, optional): The maximum number of results to return. Default is 5.
+            language (str, optional): The language of the search results. Default is "en".
+
+        Returns:
+            str: A JSON formatted string containing the search results.
+        """
+        key = SearchCache.key(query, max_results, language)
+        results = self.cache.get_or_fetch(key, lambda: self._search(query, max_results, language))
+        if not isinstance(results, list):
+            return results if isinstance(results, str) else json.dumps(results)
+        return json.dumps(self._dedupe(results) if self.dedupe else results, ensure_ascii=False)
@@ -0,0 +1,196 @@
+# web_reader.py
+# read_articles için hızlı sayfa okuma hattı: yanıt gövdesi parça parça akıtılır, metin
+# artımlı bir ayrıştırıcıyla toplanır ve yeterli görünür metin toplandığında indirme kesilir.
+# lxml kuruluysa onun hedef (target) ayrıştırıcısı, değilse stdlib html.parser kullanılır.
+import codecs
+import re
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # lxml isteğe bağlı
+    _lxml_etree = None
+
+USER_AGENT = 'Mozilla/5.0'
+SKIP_TAGS = frozenset(['script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'template'])
+CHUNK_SIZE = 16 * 1024
+DEFAULT_MAX_BYTES = 1536 * 1024
+_WHITESPACE_RE = re.compile(r'\s+')
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+
+def _build_session(pool_size: int = 16) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+# URL'ler ve çalıştırmalar arasında keep-alive bağlantıları paylaşan havuzlu oturum
+session = _build_session()
+
+
+class _TextCollector:
+    """Görünür metni toplar; `limit` karaktere ulaşınca `full` olur.
+
+    Hem lxml'in target arayüzüne (start/end/data/close) hem de aşağıdaki stdlib
+    ayrıştırıcı sarmalayıcısına hizmet eder.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.parts: list[str] = []
+        self.size = 0
+        self._skip_depth = 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.limit
+
+    def start(self, tag, attrib=None):
+        if isinstance(tag, str) and tag.lower() in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag):
+        if isinstance(tag, str) and tag.lower() in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, text):
+        if self._skip_depth or self.full:
+            return
+        text = text.strip()
+        if text:
+            self.parts.append(text)
+            self.size += len(text) + 1
+
+    def close(self) -> str:
+        return ' '.join(self.parts)
+
+
+class _StdlibFeedParser(HTMLParser):
+    def __init__(self, collector: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class _IncrementalExtractor:
+    def __init__(self, limit: int):
+        self.collector = _TextCollector(limit)
+        if _lxml_etree is not None:
+            self._parser = _lxml_etree.HTMLParser(target=self.collector, recover=True)
+        else:
+            self._parser = _StdlibFeedParser(self.collector)
+
+    @property
+    def full(self) -> bool:
+        return self.collector.full
+
+    def feed(self, text: str):
+        if text:
+            self._parser.feed(text)
+
+    def close(self) -> str:
+        try:
+            self._parser.close()
+        except Exception:
+            # Yarıda kesilen belgelerde ayrıştırıcı kapanışta hata verebilir; toplanan metin yeterli
+            pass
+        return self.collector.close()
+
+
+def clean_text(text: str) -> str:
+    """Boşlukları tekleştirir ve yazdırılamayan karakterleri atar (C seviyesinde)."""
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    if text.isprintable():
+        return text
+    return ''.join(filter(str.isprintable, text))
+
+
+def _detect_encoding(response: requests.Response, head: bytes) -> str:
+    content_type = response.headers.get('Content-Type', '')
+    if 'charset=' in content_type.lower():
+        return response.encoding or 'utf-8'
+    match = _META_CHARSET_RE.search(head)
+    if match:
+        return match.group(1).decode('ascii', errors='ignore') or 'utf-8'
+    return 'utf-8'
+
+
+def extract_text(chunks, max_chars: int, encoding: str = 'utf-8') -> str:
+    """Bayt parçalarından görünür metni çıkarır; `max_chars` toplanınca durur."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = _IncrementalExtractor(max_chars)
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        if extractor.full:
+            break
+    else:
+        extractor.feed(decoder.decode(b'', final=True))
+    return clean_text(extractor.close())
+
+
+@dataclass
+class FetchResult:
+    status_code: int
+    text: str = ''
+    etag: str | None = None
+    last_modified: str | None = None
+    bytes_read: int = 0
+    # Süre bütçesi dolduğu için okuma yarıda kesildiyse metin eksiktir
+    timed_out: bool = False
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+
+def fetch_page(url: str, timeout: float = 6, max_chars: int = 3000, max_bytes: int = DEFAULT_MAX_BYTES,
+               headers: dict | None = None) -> FetchResult:
+    """Sayfayı akıtarak indirir; metin veya bayt sınırına ya da süre bütçesine ulaşınca keser."""
+    deadline = time.monotonic() + timeout
+    with session.get(url, timeout=timeout, headers=headers, stream=True) as response:
+        if response.status_code == 304:
+            return FetchResult(304)
+        response.raise_for_status()
+
+        result = FetchResult(
+            response.status_code,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        raw = response.iter_content(chunk_size=CHUNK_SIZE)
+        first = next(raw, b'')
+
+        def chunks():
+            chunk = first
+            while chunk:
+                result.bytes_read += len(chunk)
+                yield chunk
+                if result.bytes_read >= max_bytes:
+                    return
+                if time.monotonic() >= deadline:
+                    result.timed_out = True
+                    return
+                chunk = next(raw, b'')
+
+        result.text = extract_text(chunks(), max_chars, _detect_encoding(response, first[:4096]))
+        return result
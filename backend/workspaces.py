@@ -0,0 +1,123 @@
+# workspaces.py
+# Çalıştırma başına yalıtılmış çıktı dizinleri: her oturum kendi klasörüne yazar, böylece
+# eşzamanlı çalıştırmalar birbirinin dosyalarını ezmez. Eski çalıştırma dizinleri yaş ve
+# toplam boyut sınırına göre arka plan thread'inde temizlenir (etkin oturumlara dokunulmaz).
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+_SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_\-]{1,64}$')
+
+
+class Workspace:
+    def __init__(self, session_id: str, path: Path):
+        self.session_id = session_id
+        self.path = path
+
+    def file(self, name: str) -> Path:
+        return self.path / name
+
+    def display_path(self, name: str) -> str:
+        """Ajan talimatlarında kullanılan mutlak dosya yolu."""
+        return str(self.file(name))
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for p in path.rglob('*'):
+        try:
+            if p.is_file():
+                total += p.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+class WorkspaceManager:
+    def __init__(self, root: Path, max_age_seconds: float = 72 * 3600, max_total_bytes: int = 512 * 1024 * 1024,
+                 gc_interval: float = 600.0, active_sessions=None):
+        """`active_sessions()` çalışmakta olan oturum kimliklerini döndürür; GC onları silmez."""
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self.gc_interval = gc_interval
+        self.active_sessions = active_sessions or (lambda: set())
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_gc = 0.0
+        self.removed = 0
+
+    def _path_for(self, session_id: str) -> Path:
+        if not _SESSION_ID_RE.match(session_id or ''):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return self.root / session_id
+
+    def create(self, session_id: str) -> Workspace:
+        path = self._path_for(session_id)
+        path.mkdir(parents=True, exist_ok=True)
+        return Workspace(session_id, path)
+
+    def get(self, session_id: str) -> Workspace | None:
+        try:
+            path = self._path_for(session_id)
+        except ValueError:
+            return None
+        return Workspace(session_id, path) if path.is_dir() else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                result = self.gc()
+                if result['removed']:
+                    print(f"Workspace GC: removed {len(result['removed'])} run directories")
+            except Exception as e:
+                print(f"Workspace GC error: {e}")
+            self._stop.wait(self.gc_interval)
+
+    def start(self):
+        """Temizliği `gc_interval` saniyede bir çalışan arka plan thread'ini başlatır."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='workspace-gc', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def gc(self) -> dict:
+        """Yaş sınırını aşan, ardından toplam boyutu aşarsa en eski çalıştırma dizinlerini siler."""
+        with self._lock:
+            self._last_gc = time.time()
+            active = set(self.active_sessions())
+            entries = []
+            for path in self.root.iterdir():
+                if not path.is_dir() or path.name in active:
+                    continue
+                try:
+                    entries.append((path.stat().st_mtime, _dir_size(path), path))
+                except OSError:
+                    continue
+            entries.sort()
+            removed = []
+            cutoff = time.time() - self.max_age_seconds
+            kept = []
+            for mtime, size, path in entries:
+                if mtime < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed.append(path.name)
+                else:
+                    kept.append((mtime, size, path))
+            total = sum(size for _, size, _ in kept)
+            for mtime, size, path in kept:
+                if total <= self.max_total_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path.name)
+                total -= size
+            self.removed += len(removed)
+            return {'removed': removed, 'remaining_bytes': total}
@@ -308,6 +308,35 @@ const PlanEditor = ({ plan, onConfirm, onCancel, isReadonly = false }) => {
   );
 };
 
+// text/event-stream yanıtını okur ve her olay için onEvent(event, data) çağırır
+const readEventStream = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const chunk = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = 'message';
+      const dataLines = [];
+      chunk.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+      });
+      if (dataLines.length === 0) continue;
+      try {
+        onEvent(event, JSON.parse(dataLines.join('\n')));
+      } catch (e) {
+        console.error('SSE olayı çözümlenemedi:', e);
+      }
+    }
+  }
+};
+
 function App() {
   const [messages, setMessages] = useState([]);
   const [input, setInput] = useState('');
@@ -412,33 +441,58 @@ function App() {
     setCurrentStage({ stage: 'research', progress: 60, message: 'Plan çalıştırılıyor - araştırma başladı...' });
 
     try {
-      const response = await fetch('http://localhost:5001/execute-plan', {
+      const response = await fetch('http://localhost:5001/execute-plan/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ plan: sanitizedPlan }),
       });
-      const data = await response.json();
-      
-      if (response.ok && data.success) {
-        setCurrentStage({ stage: 'analyze', progress: 80, message: 'Analiz tamamlanıyor...' });
-        
-        setTimeout(() => {
-          const docs = Array.isArray(data?.documents) ? data.documents : [];
-          if (docs.length > 0) {
-            setMessages(prev => [
-              ...prev,
-              ...docs.map(d => ({ sender: 'agent', isComplete: true, isDocument: true, filename: d.filename, text: d.content }))
-            ]);
-          } else {
-            const agentMessage = { text: data.result, sender: 'agent', isComplete: true };
-            setMessages(prev => [...prev, agentMessage]);
-          }
-          setCurrentStage({ stage: 'completed', progress: 100, message: 'İş analizi başarıyla tamamlandı!' });
-          setIsLoading(false);
-        }, 1000);
-      } else {
+      if (!response.ok || !response.body) {
+        const data = await response.json().catch(() => ({}));
         throw new Error(data.error || 'Plan çalıştırma sırasında hata oluştu');
       }
+
+      // Dokümanlar yazıldıkça baloncuk olarak gösterilir; aynı dosya tekrar gelirse güncellenir
+      const upsertDocument = (doc) => {
+        setMessages(prev => {
+          const idx = prev.findIndex(m => m.isDocument && m.isStreamed && m.filename === doc.filename);
+          const docMessage = { sender: 'agent', isComplete: true, isDocument: true, isStreamed: true, filename: doc.filename, text: doc.content };
+          if (idx === -1) return [...prev, docMessage];
+          const next = [...prev];
+          next[idx] = docMessage;
+          return next;
+        });
+      };
+
+      let data = null;
+      let streamError = null;
+      await readEventStream(response, (event, payload) => {
+        if (event === 'member_started' && payload.member) {
+          setCurrentStage({ stage: 'research', progress: 65, message: `Çalışıyor: ${payload.member}` });
+        } else if (event === 'tool_call_started' && payload.tool === 'google_search') {
+          setCurrentStage({ stage: 'research', progress: 65, message: `Aranıyor: ${payload.args?.query || ''}` });
+        } else if (event === 'tool_call_started' && payload.tool === 'read_articles') {
+          setCurrentStage({ stage: 'research', progress: 70, message: 'Kaynaklar okunuyor...' });
+        } else if (event === 'document') {
+          setCurrentStage({ stage: 'analyze', progress: 80, message: `${payload.filename} yazıldı` });
+          upsertDocument(payload);
+        } else if (event === 'result') {
+          data = payload;
+        } else if (event === 'error' || event === 'cancelled') {
+          streamError = payload.error || 'Plan çalıştırma iptal edildi';
+        }
+      });
+
+      if (streamError || !data?.success) {
+        throw new Error(streamError || data?.error || 'Plan çalıştırma sırasında hata oluştu');
+      }
+      const docs = Array.isArray(data?.documents) ? data.documents : [];
+      if (docs.length > 0) {
+        docs.forEach(upsertDocument);
+      } else {
+        setMessages(prev => [...prev, { text: data.result, sender: 'agent', isComplete: true }]);
+      }
+      setCurrentStage({ stage: 'completed', progress: 100, message: 'İş analizi başarıyla tamamlandı!' });
+      setIsLoading(false);
     } catch (error) {
       handleApiError(error, 'plan çalıştırma');
     } finally {